@@ -25,7 +25,7 @@ from pydantic import BaseModel
 import uvicorn
 
 # Import our modules
-from pipeline import process_document
+from pipeline import process_document, workers_from_env
 from models import PipelineResult, Decision
 
 
@@ -42,8 +42,11 @@ ALLOWED_EXTENSIONS = {".pdf", ".jpg", ".jpeg", ".png", ".tif", ".tiff", ".webp",
 # Task storage (in production, use Redis or database)
 tasks: Dict[str, Dict[str, Any]] = {}
 
-# Thread pool for CPU-bound tasks
-executor = ThreadPoolExecutor(max_workers=4)
+# Thread pool for document processing. Kept small and separate from
+# PIPELINE_WORKERS: each job makes LLM calls, so this bounds API rate-limit
+# usage and cost (size via API_WORKERS)
+API_WORKERS = workers_from_env("API_WORKERS", 4)
+executor = ThreadPoolExecutor(max_workers=API_WORKERS)
 
 
 # =============================================================================
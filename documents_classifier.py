@@ -12,10 +12,18 @@ Dependencies:
 """
 
 import os
+import copy
 import json
+import time
+import pickle
 import base64
+import hashlib
+import threading
+import warnings
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 from openai import OpenAI
 from dotenv import load_dotenv
@@ -28,7 +36,21 @@ from models import (
     DocumentType,
     CreationMethod,
 )
+try:
+    import orjson
+except ImportError:  # Optional: faster parsing of LLM JSON responses
+    orjson = None
+
+try:
+    from cachetools import TTLCache
+except ImportError:  # Optional: falls back to a small built-in TTL LRU
+    TTLCache = None
+
 from prompts import (
+    PROMPT_VERSION,
+    PROMPT_SCHEMA_VERSIONS,
+    make_cache_key,
+    get_cached_prompt_handle,
     get_classification_prompt,
     PDF_CLASSIFICATION_PROMPT,
     IMAGE_CLASSIFICATION_PROMPT,
@@ -42,6 +64,16 @@ from prompts import (
 _client = None
 MODEL = "gpt-4o"
 
+# Images from a PDF sent to image analysis (token limit)
+MAX_ANALYZED_IMAGES = 10
+
+# In-process cache of parsed LLM responses (re-uploaded files skip the LLM)
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "10000"))  # 0 disables
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "600"))  # seconds
+
+# On-disk cache of whole analyses, kept across runs (unset disables)
+ANALYSIS_CACHE_DIR = os.getenv("ANALYSIS_CACHE_DIR")
+
 
 def get_openai_client():
     """Get OpenAI client (lazy initialization)."""
@@ -99,11 +131,103 @@ def get_pdf_page_count(file_path: str) -> Optional[int]:
         return None
 
 
+@lru_cache(maxsize=1024)
+def _hash_file(file_path: str, mtime_ns: int, size: int) -> str:
+    """SHA-256 of file contents; mtime/size in the key invalidate edited files."""
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def get_file_hash(file_path: str) -> str:
+    """Content hash of a file, memoized per file version."""
+    st = os.stat(file_path)
+    return _hash_file(str(file_path), st.st_mtime_ns, st.st_size)
+
+
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+class _SimpleTTLCache:
+    """Minimal TTL + LRU mapping, used when cachetools isn't installed."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires, value = item
+        if expires < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+_response_cache = (TTLCache or _SimpleTTLCache)(
+    maxsize=max(RESPONSE_CACHE_SIZE, 1), ttl=RESPONSE_CACHE_TTL
+)
+_response_cache_lock = threading.Lock()
+
+
+def cached_llm_call(file_path: str, label: str, call: Callable[[], dict]) -> dict:
+    """
+    Run an LLM call for a file, reusing the parsed response for identical content.
+
+    Args:
+        file_path: File the call is about (its content hash is the key)
+        label: Document type or stage label; must capture everything else
+            that varies in the prompt
+        call: Zero-argument function making the actual LLM call
+
+    Returns:
+        Parsed response dict (a private copy; callers may modify it)
+    """
+    if RESPONSE_CACHE_SIZE <= 0:
+        return call()
+
+    try:
+        key = make_cache_key(get_file_hash(file_path), label)
+    except OSError:
+        return call()
+
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+
+    response = call()
+
+    # Errors are usually transient (rate limits, timeouts) - don't pin them
+    if "error" not in response:
+        with _response_cache_lock:
+            _response_cache[key] = copy.deepcopy(response)
+    return response
+
+
 # =============================================================================
 # LLM CALLS
 # =============================================================================
 
-def call_llm_with_image(prompt: str, image_path: str) -> dict:
+def _cache_kwargs(cache_key: Optional[str]) -> dict:
+    """Extra create() arguments routing a request to the provider prompt cache."""
+    return {"prompt_cache_key": cache_key} if cache_key else {}
+
+
+def call_llm_with_image(prompt: str, image_path: str, cache_key: Optional[str] = None) -> dict:
     """Call LLM with an image file."""
     base64_image = encode_image_to_base64(image_path)
     media_type = get_image_media_type(image_path)
@@ -127,12 +251,13 @@ def call_llm_with_image(prompt: str, image_path: str) -> dict:
         ],
         max_tokens=2000,
         temperature=0.1,
+        **_cache_kwargs(cache_key),
     )
 
     return parse_json_response(response.choices[0].message.content)
 
 
-def call_llm_with_pdf(prompt: str, pdf_path: str) -> dict:
+def call_llm_with_pdf(prompt: str, pdf_path: str, cache_key: Optional[str] = None) -> dict:
     """Call LLM with a PDF file."""
     with open(pdf_path, "rb") as f:
         pdf_data = base64.standard_b64encode(f.read()).decode("utf-8")
@@ -157,6 +282,7 @@ def call_llm_with_pdf(prompt: str, pdf_path: str) -> dict:
         ],
         max_tokens=2000,
         temperature=0.1,
+        **_cache_kwargs(cache_key),
     )
 
     return parse_json_response(response.choices[0].message.content)
@@ -178,8 +304,10 @@ def parse_json_response(content: str) -> dict:
     content = content.strip()
 
     try:
+        if orjson is not None:
+            return orjson.loads(content)
         return json.loads(content)
-    except json.JSONDecodeError as e:
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
         return {"error": f"JSON parse error: {e}", "raw_content": content}
 
 
@@ -187,7 +315,11 @@ def parse_json_response(content: str) -> dict:
 # IMAGE EXTRACTION FROM PDF
 # =============================================================================
 
-def extract_images_from_pdf(pdf_path: str, min_size: int = 100) -> dict:
+def extract_images_from_pdf(
+    pdf_path: str,
+    min_size: int = 100,
+    max_images: Optional[int] = None
+) -> dict:
     """
     Extract embedded images from PDF using PyMuPDF.
 
@@ -197,6 +329,8 @@ def extract_images_from_pdf(pdf_path: str, min_size: int = 100) -> dict:
     Args:
         pdf_path: Path to PDF file
         min_size: Minimum image dimension to include (filters out icons/logos)
+        max_images: Decode at most this many images; later ones are still
+            counted in pages_with_images/total_images but not extracted
 
     Returns:
         Dictionary with extraction results:
@@ -221,13 +355,24 @@ def extract_images_from_pdf(pdf_path: str, min_size: int = 100) -> dict:
     doc = fitz.open(pdf_path)
     images = []
     pages_with_images = set()
+    total_images = 0
 
     for page_num, page in enumerate(doc):
         page_number = page_num + 1
         embedded_images = page.get_images()
 
         for img_idx, img in enumerate(embedded_images):
-            xref = img[0]
+            xref, width, height = img[0], img[2], img[3]
+
+            # Size is known from the image list - skip icons without decoding
+            if width < min_size or height < min_size:
+                continue
+
+            if max_images is not None and len(images) >= max_images:
+                total_images += 1
+                pages_with_images.add(page_number)
+                continue
+
             try:
                 base_image = doc.extract_image(xref)
                 width = base_image["width"]
@@ -245,6 +390,7 @@ def extract_images_from_pdf(pdf_path: str, min_size: int = 100) -> dict:
                         "data": base_image["image"]
                     })
                     pages_with_images.add(page_number)
+                    total_images += 1
             except Exception:
                 continue
 
@@ -254,17 +400,18 @@ def extract_images_from_pdf(pdf_path: str, min_size: int = 100) -> dict:
         "extraction_method": "embedded" if images else "none",
         "images": images,
         "pages_with_images": sorted(pages_with_images),
-        "total_images": len(images)
+        "total_images": total_images
     }
 
 
-def call_llm_with_images(prompt: str, images: list) -> dict:
+def call_llm_with_images(prompt: str, images: list, cache_key: Optional[str] = None) -> dict:
     """
     Call LLM with multiple images for batch analysis.
 
     Args:
         prompt: Analysis prompt
         images: List of image dicts with "data" (bytes) and "format" fields
+        cache_key: Provider prompt-cache key (see prompts.get_cached_prompt_handle)
 
     Returns:
         Parsed JSON response
@@ -302,6 +449,7 @@ def call_llm_with_images(prompt: str, images: list) -> dict:
         messages=[{"role": "user", "content": content}],
         max_tokens=3000,
         temperature=0.1,
+        **_cache_kwargs(cache_key),
     )
 
     return parse_json_response(response.choices[0].message.content)
@@ -326,8 +474,8 @@ def analyze_pdf_images(pdf_path: str, classification_has_images: bool = True) ->
     """
     from prompts import get_image_analysis_prompt
 
-    # Try to extract embedded images
-    extraction = extract_images_from_pdf(pdf_path)
+    # Try to extract embedded images (only as many as will be analyzed)
+    extraction = extract_images_from_pdf(pdf_path, max_images=MAX_ANALYZED_IMAGES)
 
     prompt = get_image_analysis_prompt()
 
@@ -335,11 +483,16 @@ def analyze_pdf_images(pdf_path: str, classification_has_images: bool = True) ->
         # SUCCESS: We extracted images - analyze them separately
         images = extraction["images"]
 
-        # Limit to first 10 images to avoid token limits
-        if len(images) > 10:
-            images = images[:10]
+        # Limit to first MAX_ANALYZED_IMAGES images to avoid token limits
+        if len(images) > MAX_ANALYZED_IMAGES:
+            images = images[:MAX_ANALYZED_IMAGES]
 
-        result = call_llm_with_images(prompt, images)
+        result = cached_llm_call(
+            pdf_path, "image_analysis",
+            lambda: call_llm_with_images(
+                prompt, images, cache_key=get_cached_prompt_handle("image_analysis")
+            )
+        )
 
         # Add extraction metadata
         result["extraction_method"] = extraction["extraction_method"]
@@ -378,7 +531,10 @@ If you see a clean room - say it's clean, regardless of what text might claim.
 
 """ + prompt
 
-        result = call_llm_with_pdf(fallback_prompt, pdf_path)
+        result = cached_llm_call(
+            pdf_path, "image_analysis_fallback",
+            lambda: call_llm_with_pdf(fallback_prompt, pdf_path)
+        )
 
         # Mark as fallback method
         result["extraction_method"] = "pdf_fallback"
@@ -409,11 +565,18 @@ def classify_document(file_path: str) -> ClassificationResult:
 
     # Get appropriate classification prompt
     classification_prompt = get_classification_prompt(file_type)
+    prompt_cache_key = get_cached_prompt_handle("classification", file_type)
 
     if file_type == "pdf":
-        response = call_llm_with_pdf(classification_prompt, file_path)
+        response = cached_llm_call(
+            file_path, f"{file_type}_classification",
+            lambda: call_llm_with_pdf(classification_prompt, file_path, prompt_cache_key)
+        )
     elif file_type == "image":
-        response = call_llm_with_image(classification_prompt, file_path)
+        response = cached_llm_call(
+            file_path, f"{file_type}_classification",
+            lambda: call_llm_with_image(classification_prompt, file_path, prompt_cache_key)
+        )
     else:
         return ClassificationResult(
             document_type="other",
@@ -435,20 +598,26 @@ def classify_document(file_path: str) -> ClassificationResult:
             _raw_response=response,
         )
 
-    # For images, map 'category' to 'document_type'
-    if file_type == "image" and "category" in response:
-        response["document_type"] = response.get("category", "other")
-        response["document_type_ua"] = response.get("category_ua", "Інше")
-        # Images don't have creation_method in the same way
-        response["creation_method"] = "original_photo"
-        if response.get("document_type") == "screenshot":
-            response["creation_method"] = "screenshot"
-        # Preserve image-specific classification fields
-        # These are already in response: shows_damage, damage_severity, damage_description
+    if file_type == "image":
+        _map_image_category(response)
 
     return ClassificationResult.from_dict(response)
 
 
+def _map_image_category(response: dict) -> None:
+    """Map an image response's 'category' onto the document_type fields, in place."""
+    if "category" not in response:
+        return
+    response["document_type"] = response.get("category", "other")
+    response["document_type_ua"] = response.get("category_ua", "Інше")
+    # Images don't have creation_method in the same way
+    response["creation_method"] = "original_photo"
+    if response.get("document_type") == "screenshot":
+        response["creation_method"] = "screenshot"
+    # Preserve image-specific classification fields
+    # These are already in response: shows_damage, damage_severity, damage_description
+
+
 # =============================================================================
 # STAGE 3: EXTRACTION
 # =============================================================================
@@ -486,11 +655,19 @@ def extract_details_with_images(
     if not prompt:
         return None
 
+    # Prompts carrying an image analysis section differ per analysis run
+    cache_label = document_type
+    if image_analysis and image_analysis.get("images"):
+        prompt_digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+        cache_label = f"{document_type}:{prompt_digest}"
+
     # Call LLM
+    prompt_cache_key = get_cached_prompt_handle(document_type, file_type)
     if file_type == "pdf":
-        response = call_llm_with_pdf(prompt, file_path)
+        call = lambda: call_llm_with_pdf(prompt, file_path, prompt_cache_key)
     else:
-        response = call_llm_with_image(prompt, file_path)
+        call = lambda: call_llm_with_image(prompt, file_path, prompt_cache_key)
+    response = cached_llm_call(file_path, cache_label, call)
 
     if "error" in response:
         return ExtractionResult(
@@ -582,11 +759,10 @@ def analyze_document(
     progress("classification", 0.20, f"Classified as {classification.document_type}")
 
     # Check if document has images (from classification)
-    has_images = getattr(classification, 'has_images', False) or \
-                 classification.__dict__.get('has_images', False)
+    has_images = classification.has_images
 
     # Also check raw response if available
-    if hasattr(classification, '_raw_response'):
+    if classification._raw_response:
         has_images = classification._raw_response.get('has_images', has_images)
 
     # =========================================================================
@@ -659,6 +835,130 @@ def analyze_document(
     return analysis
 
 
+def analyze_image_fast(
+    file_path: str,
+    on_progress: callable = None
+) -> DocumentAnalysis:
+    """
+    Analyze a standalone image with a single LLM call.
+
+    Image files never go through PDF image extraction, so classification and
+    extraction can share one request (IMAGE_FAST_PROMPT). The result has the
+    same shape as analyze_document() output.
+
+    Args:
+        file_path: Path to image file
+        on_progress: Optional callback(stage, progress, message) for progress updates
+
+    Returns:
+        DocumentAnalysis with combined results
+    """
+    from prompts import get_image_fast_prompt
+
+    def progress(stage: str, pct: float, msg: str = ""):
+        if on_progress:
+            on_progress(stage, pct, msg)
+
+    progress("classification", 0.10, "Classifying and extracting image details...")
+    response = cached_llm_call(
+        file_path, "image_fast",
+        lambda: call_llm_with_image(
+            get_image_fast_prompt(), file_path, get_cached_prompt_handle("image_fast", "image")
+        )
+    )
+
+    if "error" in response:
+        classification = ClassificationResult(
+            document_type="other",
+            document_type_ua="Помилка обробки",
+            creation_method="unknown",
+            brief_description=response.get("error", "Unknown error"),
+            classification_confidence=0.0,
+            red_flags=["Classification failed"],
+            _raw_response=response,
+        )
+        extraction = None
+    else:
+        _map_image_category(response)
+        classification = ClassificationResult.from_dict(response)
+        extraction = ExtractionResult.from_dict(response, classification.document_type, "image")
+
+    progress("extraction", 0.75, f"Classified as {classification.document_type}")
+
+    progress("combining", 0.80, "Combining analysis results...")
+    analysis = DocumentAnalysis.from_stages(
+        file_path=file_path,
+        file_type="image",
+        classification=classification,
+        extraction=extraction,
+    )
+
+    progress("done", 0.85, "Document analysis complete")
+    return analysis
+
+
+# Red flags marking a stage that failed (usually transiently) - not cached
+ANALYSIS_FAILURE_FLAGS = frozenset({"Classification failed", "Detail extraction failed"})
+
+
+def analysis_version() -> str:
+    """
+    Version tag for cached analyses: PROMPT_VERSION, the model and every
+    prompt's schema version (an analysis runs several prompts).
+    """
+    schemas = ",".join(
+        f"{prompt}@{version}" for prompt, version in sorted(PROMPT_SCHEMA_VERSIONS.items())
+    )
+    return f"{PROMPT_VERSION}:{MODEL}:{schemas}"
+
+
+def _analysis_cache_path(file_path: str) -> Optional[Path]:
+    """Disk cache file for a file's analysis, or None if the cache is off."""
+    if not ANALYSIS_CACHE_DIR:
+        return None
+    key = f"analysis:{analysis_version()}:{get_file_hash(file_path)}"
+    name = hashlib.sha256(key.encode()).hexdigest()
+    return Path(ANALYSIS_CACHE_DIR) / f"{name}.pkl"
+
+
+def analyze_document_cached(file_path: str, on_progress: callable = None) -> DocumentAnalysis:
+    """
+    analyze_document with results persisted under ANALYSIS_CACHE_DIR.
+
+    Keyed by file content hash, PROMPT_VERSION, every prompt's schema
+    version and the model, so re-runs over the same files skip
+    classification and extraction entirely, while edited files and prompt,
+    schema or model changes miss. Without ANALYSIS_CACHE_DIR this
+    is just analyze_document.
+    """
+    try:
+        cache_path = _analysis_cache_path(file_path)
+    except OSError:
+        cache_path = None
+    if cache_path is None:
+        return analyze_document(file_path, on_progress=on_progress)
+
+    try:
+        with open(cache_path, "rb") as f:
+            analysis = pickle.load(f)
+        analysis.file_path = file_path
+        return analysis
+    except Exception:
+        pass  # Missing or unreadable entry - recompute
+
+    analysis = analyze_document(file_path, on_progress=on_progress)
+
+    if ANALYSIS_FAILURE_FLAGS.isdisjoint(analysis.red_flags):
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(analysis, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            warnings.warn(f"Could not write analysis cache: {e}", RuntimeWarning)
+
+    return analysis
 
 
 # =============================================================================
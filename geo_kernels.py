@@ -0,0 +1,96 @@
+"""
+Compiled Geo Kernels
+
+Hot numeric loops behind the geo validators:
+- Haversine distance (scalar and per-element over arrays)
+- Bounding-box membership over arrays
+
+Kernels are compiled with numba when it is installed: cache=True keeps the
+machine code on disk between runs, nogil=True lets worker threads run them
+in parallel, and the array kernels split their loop across cores (prange).
+Without numba they are plain Python and callers should prefer their NumPy
+paths (see HAVE_NUMBA).
+"""
+
+from math import radians, sin, cos, sqrt, atan2
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: compiled kernels
+    njit = None
+    prange = range
+
+
+HAVE_NUMBA = njit is not None
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def _kernel(fastmath: bool = False, parallel: bool = False):
+    """njit(cache=True, nogil=True) when numba is available, else identity."""
+    def wrap(fn):
+        if njit is None:
+            return fn
+        return njit(cache=True, nogil=True, fastmath=fastmath, parallel=parallel)(fn)
+    return wrap
+
+
+# =============================================================================
+# DISTANCE
+# =============================================================================
+
+@_kernel(fastmath=True)
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in km between two points given in degrees."""
+    lat1 = radians(lat1)
+    lon1 = radians(lon1)
+    lat2 = radians(lat2)
+    lon2 = radians(lon2)
+
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+    c = 2 * atan2(sqrt(a), sqrt(1-a))
+
+    return EARTH_RADIUS_KM * c
+
+
+@_kernel(fastmath=True, parallel=True)
+def haversine_km_array(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+) -> np.ndarray:
+    """Per-element haversine_km over four 1-D float64 arrays of equal length."""
+    out = np.empty(lat1.shape[0])
+    for i in prange(lat1.shape[0]):
+        out[i] = haversine_km(lat1[i], lon1[i], lat2[i], lon2[i])
+    return out
+
+
+# =============================================================================
+# BOUNDING BOX
+# =============================================================================
+
+# No fastmath here: NaN coordinates must compare False (outside the box)
+@_kernel(parallel=True)
+def in_bounds_array(
+    lat: np.ndarray,
+    lon: np.ndarray,
+    min_lat: float,
+    max_lat: float,
+    min_lon: float,
+    max_lon: float,
+) -> np.ndarray:
+    """Per-element min <= value <= max check over 1-D float64 lat/lon arrays."""
+    out = np.empty(lat.shape[0], dtype=np.bool_)
+    for i in prange(lat.shape[0]):
+        out[i] = (
+            min_lat <= lat[i] <= max_lat
+            and min_lon <= lon[i] <= max_lon
+        )
+    return out
@@ -405,7 +405,7 @@ def get_camera_specs(model_name: str) -> dict:
 # DATA CLASSES
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class MetadataGroups:
     """Container for grouped metadata with interpretation support."""
     
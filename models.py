@@ -8,6 +8,7 @@ Defines common structures for:
 """
 
 from dataclasses import dataclass, field
+from datetime import datetime
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
@@ -64,7 +65,7 @@ class Decision(str, Enum):
 # STAGE 1: CLASSIFICATION
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ClassificationResult:
     """
     Stage 1 output: Document classification.
@@ -139,7 +140,7 @@ class ClassificationResult:
 # STAGE 2: EXTRACTION
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ExtractionResult:
     """
     Stage 2 output: Detail extraction.
@@ -396,7 +397,7 @@ class ExtractionResult:
 # COMBINED ANALYSIS
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class DocumentAnalysis:
     """
     Combined result from classification + extraction stages.
@@ -550,11 +551,17 @@ class DocumentAnalysis:
         return result
 
 
+def iso_from_ns(time_ns: int) -> str:
+    """Local-time ISO string for a time.time_ns() value (microsecond precision)."""
+    seconds, ns = divmod(time_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=ns // 1000).isoformat()
+
+
 # =============================================================================
 # VALIDATION RESULT (from validators.py - kept for compatibility)
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ValidationResult:
     """Result of metadata validation checks."""
 
@@ -576,8 +583,16 @@ class ValidationResult:
     # Processing info
     file_path: str = ""
     validation_timestamp: str = ""
+    validation_time_ns: int = 0  # time.time_ns(); formatted lazily
     rules_applied: List[str] = field(default_factory=list)
 
+    @property
+    def validation_timestamp_iso(self) -> str:
+        """validation_timestamp, formatted from validation_time_ns on first access."""
+        if not self.validation_timestamp and self.validation_time_ns:
+            self.validation_timestamp = iso_from_ns(self.validation_time_ns)
+        return self.validation_timestamp
+
     def add_error(self, message: str, check_name: str = None):
         """Add blocking error."""
         self.errors.append(message)
@@ -614,7 +629,7 @@ class ValidationResult:
             "checks_failed": self.checks_failed,
             "extracted_data": self.extracted_data,
             "file_path": self.file_path,
-            "validation_timestamp": self.validation_timestamp,
+            "validation_timestamp": self.validation_timestamp_iso,
             "rules_applied": self.rules_applied,
         }
 
@@ -623,7 +638,7 @@ class ValidationResult:
 # PIPELINE RESULT
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class PipelineResult:
     """
     Final output of the complete processing pipeline.
@@ -634,6 +649,7 @@ class PipelineResult:
     file_path: str = ""
     file_type: str = ""
     timestamp: str = ""
+    time_ns: int = 0  # time.time_ns(); formatted lazily
 
     # Document analysis (from LLM)
     analysis: Optional[DocumentAnalysis] = None
@@ -652,11 +668,21 @@ class PipelineResult:
     warnings: List[str] = field(default_factory=list)
     red_flags: List[str] = field(default_factory=list)
 
+    # Memoized summary() text; results aren't modified after construction
+    _summary: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def timestamp_iso(self) -> str:
+        """timestamp, formatted from time_ns on first access."""
+        if not self.timestamp and self.time_ns:
+            self.timestamp = iso_from_ns(self.time_ns)
+        return self.timestamp
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "file_path": self.file_path,
             "file_type": self.file_type,
-            "timestamp": self.timestamp,
+            "timestamp": self.timestamp_iso,
             "analysis": self.analysis.to_dict() if self.analysis else None,
             "validation": self.validation.to_dict() if self.validation else None,
             "decision": self.decision,
@@ -670,6 +696,9 @@ class PipelineResult:
 
     def summary(self) -> str:
         """Human-readable summary."""
+        if self._summary is not None:
+            return self._summary
+
         icon = {"ACCEPT": "✅", "REVIEW": "⚠️", "REJECT": "❌"}.get(self.decision, "❓")
 
         lines = [
@@ -685,4 +714,5 @@ class PipelineResult:
         if self.red_flags:
             lines.append(f"   Red flags: {len(self.red_flags)}")
 
-        return "\n".join(lines)
\ No newline at end of file
+        self._summary = "\n".join(lines)
+        return self._summary
\ No newline at end of file
@@ -19,16 +19,38 @@ Usage:
         print(f"[{progress*100:.0f}%] {stage}: {message}")
 
     result = process_document("doc.pdf", on_progress=on_progress)
+
+Environment:
+    PIPELINE_WORKERS: Worker threads for concurrent document processing
+        (default: 4 x available CPUs, since workers mostly wait on LLM HTTP calls)
+    ANALYSIS_CACHE_DIR: Directory for persisting document analyses across runs,
+        keyed by file content (unset: no disk cache)
 """
 
+import asyncio
+import copy
+import hashlib
 import json
-from datetime import datetime
+import os
+import time
+import warnings
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import lru_cache, partial
+from itertools import chain
 from pathlib import Path
+from types import MappingProxyType
 from typing import List, Callable, Optional
 
-# Import from our modules
-from documents_classifier import analyze_document
-from validators import validate_file, make_decision
+try:
+    import orjson
+except ImportError:  # Optional: faster serialization for CLI output
+    orjson = None
+
+# Import from our modules. documents_classifier and validators pull in the
+# LLM SDK, PyMuPDF, PIL and pypdf, so they are imported inside
+# process_document to keep `import pipeline` cheap for report-only callers.
 from models import (
     DocumentAnalysis,
     ValidationResult,
@@ -37,6 +59,124 @@ from models import (
 )
 
 
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Read size used when prefetching upcoming batch files
+PREFETCH_CHUNK_SIZE = 1024 * 1024
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects affinity/cgroup pinning where exposed)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def workers_from_env(name: str, default: int) -> int:
+    """
+    Worker count from environment variable `name`, or default if unset.
+
+    Invalid values warn and fall back to default rather than failing at
+    import time; values below 1 are clamped to 1.
+    """
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return max(1, default)
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        warnings.warn(
+            f"{name}={raw!r} is not an integer; using {default} workers", RuntimeWarning
+        )
+        return max(1, default)
+
+
+# Worker threads for concurrent processing; I/O-bound, hence the x4
+DEFAULT_WORKERS = workers_from_env("PIPELINE_WORKERS", available_cpus() * 4)
+
+
+# =============================================================================
+# VALIDATION CACHE
+# =============================================================================
+
+@lru_cache(maxsize=1024)
+def _cached_validate(
+    file_path: str,
+    mtime_ns: int,
+    size: int,
+    file_type: str,
+    document_type: str,
+    creation_method: str,
+    today: str,
+):
+    """
+    Validate a file version once per process and day.
+
+    mtime_ns and size are only part of the cache key so that an edited file
+    is validated again, and today (ISO date) so that date checks ("in the
+    future", document age) are redone once the date changes. validate_file
+    only reads file_type, document_type and creation_method from the
+    analysis, so a stub analysis is rebuilt here.
+    """
+    from validators import validate_file
+
+    analysis = DocumentAnalysis(
+        file_path=file_path,
+        file_type=file_type,
+        document_type=document_type,
+        creation_method=creation_method,
+    )
+    return validate_file(file_path, analysis)
+
+
+def validate_file_cached(
+    file_path: str,
+    analysis: DocumentAnalysis,
+    time_ns: Optional[int] = None,
+    with_metadata: bool = False,
+):
+    """
+    validate_file() memoized on (path, mtime, size, analysis key, date).
+
+    Avoids re-reading EXIF/PDF metadata when the same file appears several
+    times in a batch. Returns a copy of the cached ValidationResult,
+    stamped with time_ns (default now), so callers can't mutate the cached
+    one. The metadata is only copied and returned with with_metadata;
+    otherwise the second element is None.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        from validators import validate_file
+        validation, metadata = validate_file(file_path, analysis)
+        if time_ns:
+            validation.validation_time_ns = time_ns
+            validation.validation_timestamp = ""
+        return validation, (metadata if with_metadata else None)
+
+    validation, metadata = _cached_validate(
+        str(file_path),
+        st.st_mtime_ns,
+        st.st_size,
+        analysis.file_type,
+        analysis.document_type,
+        analysis.creation_method,
+        date.today().isoformat(),
+    )
+    validation = copy.deepcopy(validation)
+    validation.validation_time_ns = time_ns or time.time_ns()
+    validation.validation_timestamp = ""
+    if not with_metadata:
+        return validation, None
+    # PDF metadata is a read-only mapping of strings; MetadataGroups holds
+    # mutable dicts
+    if metadata is not None and not isinstance(metadata, MappingProxyType):
+        metadata = copy.deepcopy(metadata)
+    return validation, metadata
+
+
 # =============================================================================
 # MAIN PIPELINE
 # =============================================================================
@@ -44,7 +184,10 @@ from models import (
 def process_document(
     file_path: str,
     verbose: bool = False,
-    on_progress: Optional[Callable[[str, float, str], None]] = None
+    on_progress: Optional[Callable[[str, float, str], None]] = None,
+    fast_images: bool = False,
+    *,
+    time_ns: Optional[int] = None,
 ) -> PipelineResult:
     """
     Process a single document through the full pipeline.
@@ -56,20 +199,38 @@ def process_document(
             - stage: str - current stage name
             - progress: float - 0.0 to 1.0
             - message: str - human-readable status
+        fast_images: Analyze image files with one combined classification +
+            extraction LLM call instead of two
+        time_ns: Result timestamp as time.time_ns() (default: now); batches
+            pass one shared value
 
     Returns:
         PipelineResult with all processing data
     """
-    timestamp = datetime.now().isoformat()
+    from documents_classifier import analyze_document_cached, analyze_image_fast, get_file_type
+    from validators import (
+        make_decision,
+        calculate_confidence,
+        deduplicate_issues_with_keys,
+    )
+
+    time_ns = time_ns or time.time_ns()
     path = Path(file_path)
+    fp_str = str(file_path)
+    fp_name = path.name
+
+    # Headless batch runs skip progress formatting entirely
+    report = verbose or on_progress is not None
 
     def progress(stage: str, pct: float, msg: str = ""):
+        if not report:
+            return
         if verbose:
             print(f"  [{pct*100:3.0f}%] {msg}")
         if on_progress:
             on_progress(stage, pct, msg)
 
-    progress("start", 0.0, f"Processing {path.name}...")
+    progress("start", 0.0, f"Processing {fp_name}...")
 
     # Step 1: Analyze document (classify + extract with images)
     # This internally handles: classification → image extraction → image analysis → extraction
@@ -80,13 +241,18 @@ def process_document(
             scaled_pct = 0.05 + (pct * 0.88)  # 0.85 * 0.88 ≈ 0.75
             progress(stage, scaled_pct, msg)
 
-        analysis = analyze_document(file_path, on_progress=analysis_progress)
+        analyzers = {"pdf": analyze_document_cached, "image": analyze_image_fast} if fast_images else {}
+        analyze = analyzers.get(get_file_type(fp_str), analyze_document_cached)
+        analysis = analyze(
+            file_path,
+            on_progress=analysis_progress if report else None
+        )
 
     except Exception as e:
         progress("error", 0.80, f"Analysis error: {str(e)}")
         # Handle analysis errors
         analysis = DocumentAnalysis(
-            file_path=str(file_path),
+            file_path=fp_str,
             file_type="unknown",
             document_type="other",
             document_type_ua="Помилка",
@@ -99,16 +265,15 @@ def process_document(
     progress("validation", 0.82, "Validating metadata...")
 
     try:
-        validation, metadata = validate_file(file_path, analysis)
+        validation, _ = validate_file_cached(file_path, analysis, time_ns)
         progress("validation", 0.90, "Metadata validated")
     except Exception as e:
         progress("validation", 0.90, f"Validation error: {str(e)}")
         validation = ValidationResult(
-            file_path=str(file_path),
-            validation_timestamp=timestamp
+            file_path=fp_str,
+            validation_time_ns=time_ns
         )
         validation.add_error(f"Validation failed: {str(e)}")
-        metadata = None
 
     # Step 3: Make decision
     progress("decision", 0.92, "Making decision...")
@@ -116,40 +281,37 @@ def process_document(
     progress("decision", 0.95, f"Decision: {decision}")
 
     # Step 4: Deduplicate ALL issues together to catch cross-category duplicates
-    from validators import calculate_confidence, deduplicate_issues
-
-    raw_errors = validation.errors.copy() if validation.errors else []
-    raw_warnings = (analysis.warnings or []) + (validation.warnings or [])
-    raw_red_flags = analysis.red_flags.copy() if analysis.red_flags else []
-
-    # Combine all, dedupe
-    all_issues_raw = raw_errors + raw_red_flags + raw_warnings
-    deduped_all = deduplicate_issues(all_issues_raw)
-    deduped_set = set(i.lower().strip() for i in deduped_all)
+    # (read-only views: the filtered lists below are what the result keeps)
+    raw_errors = validation.errors or []
+    raw_red_flags = analysis.red_flags or []
+    raw_warnings = (analysis.warnings or [], validation.warnings or [])
+
+    # Combine all, dedupe (chained: nothing else needs the combined list)
+    _, deduped_set = deduplicate_issues_with_keys(
+        chain(raw_errors, raw_red_flags, *raw_warnings)
+    )
 
     # Filter originals to keep only deduped ones
     deduped_errors = [e for e in raw_errors if e.lower().strip() in deduped_set]
     deduped_red_flags = [f for f in raw_red_flags if f.lower().strip() in deduped_set]
-    deduped_warnings = [w for w in raw_warnings if w.lower().strip() in deduped_set]
+    deduped_warnings = [w for w in chain(*raw_warnings) if w.lower().strip() in deduped_set]
 
     # Step 5: Calculate confidence using new two-stage logic
     llm_confidence = analysis.confidence  # Already classification × extraction
     validation_confidence = validation.confidence
-    all_issues = deduped_errors + deduped_red_flags + deduped_warnings
-
     final_confidence = calculate_confidence(
         llm_confidence,
         validation_confidence,
-        all_issues
+        chain(deduped_errors, deduped_red_flags, deduped_warnings)
     )
 
     # Step 6: Compile result
     progress("finalizing", 0.98, "Finalizing result...")
 
     result = PipelineResult(
-        file_path=str(file_path),
+        file_path=fp_str,
         file_type=analysis.file_type,
-        timestamp=timestamp,
+        time_ns=time_ns,
         analysis=analysis,
         validation=validation,
         decision=decision,
@@ -166,11 +328,102 @@ def process_document(
     return result
 
 
+def _prefetch_file(file_path: str) -> None:
+    """Read a file once so the pipeline's own reads hit the OS page cache."""
+    try:
+        with open(file_path, "rb") as f:
+            while f.read(PREFETCH_CHUNK_SIZE):
+                pass
+    except OSError:
+        # process_document reports missing/unreadable files itself
+        pass
+
+
+class _FileProgressAdapter:
+    """Per-file progress callback for process_batch, reused across files."""
+
+    __slots__ = ("i", "total", "cb")
+
+    def __init__(self, total: int, cb: Callable[[int, int, str, float, str], None]):
+        self.i = 0
+        self.total = total
+        self.cb = cb
+
+    def __call__(self, stage: str, pct: float, msg: str) -> None:
+        self.cb(self.i, self.total, stage, pct, msg)
+
+
+def _file_digest(file_path: str) -> Optional[bytes]:
+    """SHA-256 of file contents, or None if the file can't be read."""
+    h = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as f:
+            while chunk := f.read(PREFETCH_CHUNK_SIZE):
+                h.update(chunk)
+    except OSError:
+        return None
+    return h.digest()
+
+
+def _duplicate_keys(file_paths: List[str]) -> List[Optional[bytes]]:
+    """
+    Content key per path, or None for files with unique content.
+
+    Only files whose size matches another file in the batch are hashed,
+    so batches without duplicates cost one stat() per file.
+    """
+    by_size = defaultdict(list)
+    for i, fp in enumerate(file_paths):
+        try:
+            by_size[os.stat(fp).st_size].append(i)
+        except OSError:
+            continue
+
+    keys = [None] * len(file_paths)
+    for indices in by_size.values():
+        if len(indices) > 1:
+            for i in indices:
+                keys[i] = _file_digest(str(file_paths[i]))
+    return keys
+
+
+def _copy_result_for(result: PipelineResult, fp_str: str) -> PipelineResult:
+    """Copy a result computed for identical content onto another path."""
+    dup = copy.deepcopy(result)
+    dup.file_path = fp_str
+    dup._summary = None
+    if dup.analysis is not None:
+        dup.analysis.file_path = fp_str
+    if dup.validation is not None:
+        dup.validation.file_path = fp_str
+    return dup
+
+
+def _error_result(fp_str: str, error: Exception) -> PipelineResult:
+    """REJECT result for a file whose processing raised."""
+    return PipelineResult(
+        file_path=fp_str,
+        file_type="unknown",
+        time_ns=time.time_ns(),
+        analysis=None,
+        validation=None,
+        decision=Decision.REJECT.value,
+        decision_reason=f"Processing error: {str(error)}",
+        confidence=0,
+        is_acceptable=False,
+        errors=[str(error)],
+        warnings=[],
+        red_flags=[],
+    )
+
+
 def process_batch(
     file_paths: List[str],
     verbose: bool = False,
     stop_on_error: bool = False,
-    on_file_progress: Optional[Callable[[int, int, str, float, str], None]] = None
+    on_file_progress: Optional[Callable[[int, int, str, float, str], None]] = None,
+    prefetch: int = 2,
+    fast_images: bool = False
 ) -> List[PipelineResult]:
     """
     Process multiple documents.
@@ -180,6 +433,12 @@ def process_batch(
         verbose: Print progress
         stop_on_error: Stop processing on first error
         on_file_progress: Optional callback(file_index, total_files, stage, progress, message)
+            Files with byte-identical content are processed once; later
+            copies reuse that result and only receive a final "done" event.
+        prefetch: Number of upcoming files to read ahead while the current one
+            waits on the LLM (0 disables). Reads run on a single background
+            thread, so disk access stays sequential on slow/network storage.
+        fast_images: Use the single-call image analysis (see process_document)
 
     Returns:
         List of PipelineResult
@@ -187,38 +446,121 @@ def process_batch(
     results = []
     total = len(file_paths)
 
-    for i, file_path in enumerate(file_paths):
-        if verbose:
-            print(f"\n[{i+1}/{total}] {Path(file_path).name}")
+    # Same content attached to several claims → one pipeline run
+    content_keys = _duplicate_keys(file_paths)
+    processed = {}
+
+    # One callback object for the whole batch; only the index changes
+    file_progress = _FileProgressAdapter(total, on_file_progress) if on_file_progress else None
 
-        # Create per-file progress callback
-        def file_progress(stage, pct, msg):
-            if on_file_progress:
-                on_file_progress(i, total, stage, pct, msg)
+    io_pool = ThreadPoolExecutor(max_workers=1) if prefetch > 0 else None
+    batch_time_ns = time.time_ns()  # One timestamp for the whole batch
+    next_prefetch = 1
+
+    try:
+        for i, file_path in enumerate(file_paths):
+            fp_str = str(file_path)
+            if verbose:
+                print(f"\n[{i+1}/{total}] {Path(fp_str).name}")
+
+            # Queue reads for the next `prefetch` files (bounded read-ahead)
+            if io_pool is not None:
+                while next_prefetch < total and next_prefetch <= i + prefetch:
+                    io_pool.submit(_prefetch_file, str(file_paths[next_prefetch]))
+                    next_prefetch += 1
+
+            key = content_keys[i]
+            if key is not None and key in processed:
+                first = processed[key]
+                if verbose:
+                    print(f"  Duplicate of {Path(first.file_path).name}, reusing result")
+                if on_file_progress:
+                    on_file_progress(i, total, "done", 1.0, f"Complete: {first.decision}")
+                results.append(_copy_result_for(first, fp_str))
+                continue
+
+            if file_progress is not None:
+                file_progress.i = i
+
+            try:
+                result = process_document(
+                    file_path,
+                    verbose=verbose,
+                    on_progress=file_progress,
+                    fast_images=fast_images,
+                    time_ns=batch_time_ns,
+                )
+                results.append(result)
+                if key is not None:
+                    processed[key] = result
+            except Exception as e:
+                if stop_on_error:
+                    raise
+                results.append(_error_result(fp_str, e))
+    finally:
+        if io_pool is not None:
+            io_pool.shutdown(wait=False, cancel_futures=True)
 
+    return results
+
+
+async def process_batch_async(
+    file_paths: List[str],
+    max_concurrent: int = DEFAULT_WORKERS,
+    fast_images: bool = False
+) -> List[PipelineResult]:
+    """
+    Process multiple documents concurrently.
+
+    Each document runs process_document on a dedicated pool of
+    max_concurrent threads (the LLM client is synchronous), which also
+    bounds the number of requests in flight at the LLM provider.
+    Byte-identical files are processed once, as in process_batch.
+
+    Args:
+        file_paths: List of file paths
+        max_concurrent: Maximum documents processed at the same time
+        fast_images: Use the single-call image analysis (see process_document)
+
+    Returns:
+        List of PipelineResult, in the order of file_paths
+    """
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=max(1, max_concurrent))
+    batch_time_ns = time.time_ns()  # One timestamp for the whole batch
+
+    async def run(file_path) -> PipelineResult:
         try:
-            result = process_document(file_path, verbose=verbose, on_progress=file_progress)
-            results.append(result)
-        except Exception as e:
-            if stop_on_error:
-                raise
-            # Create error result
-            error_result = PipelineResult(
-                file_path=str(file_path),
-                file_type="unknown",
-                timestamp=datetime.now().isoformat(),
-                analysis=None,
-                validation=None,
-                decision=Decision.REJECT.value,
-                decision_reason=f"Processing error: {str(e)}",
-                confidence=0,
-                is_acceptable=False,
-                errors=[str(e)],
-                warnings=[],
-                red_flags=[],
+            return await loop.run_in_executor(
+                pool,
+                partial(process_document, file_path, fast_images=fast_images, time_ns=batch_time_ns),
             )
-            results.append(error_result)
+        except Exception as e:
+            return _error_result(str(file_path), e)
+
+    # One task per distinct content; copies are filled in afterwards
+    content_keys = _duplicate_keys(file_paths)
+    first_index = {}
+    tasks = {}
+    for i, (file_path, key) in enumerate(zip(file_paths, content_keys)):
+        if key is not None and key in first_index:
+            continue
+        if key is not None:
+            first_index[key] = i
+        tasks[i] = asyncio.ensure_future(run(file_path))
 
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for i, (file_path, key) in enumerate(zip(file_paths, content_keys)):
+        if i in tasks:
+            results.append(tasks[i].result())
+        else:
+            first = tasks[first_index[key]].result()
+            results.append(_copy_result_for(first, str(file_path)))
     return results
 
 
@@ -236,9 +578,10 @@ def generate_report(results: List[PipelineResult]) -> str:
     if total == 0:
         return "No results to report."
 
-    accepted = sum(1 for r in results if r.decision == Decision.ACCEPT.value)
-    review = sum(1 for r in results if r.decision == Decision.REVIEW.value)
-    rejected = sum(1 for r in results if r.decision == Decision.REJECT.value)
+    counts = Counter(r.decision for r in results)
+    accepted = counts[Decision.ACCEPT.value]
+    review = counts[Decision.REVIEW.value]
+    rejected = counts[Decision.REJECT.value]
 
     lines = [
         "=" * 60,
@@ -264,6 +607,17 @@ def generate_report(results: List[PipelineResult]) -> str:
 # CLI
 # =============================================================================
 
+def _dumps(obj) -> bytes:
+    """Serialize to indented UTF-8 JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+
+
 if __name__ == "__main__":
     import sys
 
@@ -289,14 +643,20 @@ if __name__ == "__main__":
         print("\n" + "=" * 60)
         print(" FULL JSON")
         print("=" * 60)
-        print(json.dumps(result.to_dict(), indent=2, ensure_ascii=False, default=str))
+        print(_dumps(result.to_dict()).decode("utf-8"))
     else:
         # Multiple files - batch mode
         results = process_batch(files, verbose=True)
         print("\n" + generate_report(results))
 
-        # Save results to JSON
+        # Save results to JSON, one element at a time so only a single
+        # result dict is materialized during serialization
         output_file = "batch_results.json"
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump([r.to_dict() for r in results], f, indent=2, ensure_ascii=False, default=str)
+        with open(output_file, "wb") as f:
+            f.write(b"[\n")
+            for i, r in enumerate(results):
+                if i:
+                    f.write(b",\n")
+                f.write(_dumps(r.to_dict()))
+            f.write(b"\n]\n")
         print(f"\nResults saved to: {output_file}")
\ No newline at end of file
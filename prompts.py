@@ -8,136 +8,168 @@ Two-stage approach:
 File types:
 - PDF: documents, certificates, scanned papers
 - Image: photos of damage, property, documents
+
+Extraction prompts are built on first use (see _LAZY_PROMPTS); the old
+constant names such as DAMAGE_ACT_PROMPT still resolve via __getattr__.
 """
 
+import hashlib
+import io
+import sys
+from functools import lru_cache, wraps
+from typing import Callable
+
+# =============================================================================
+# VERSIONING
+# =============================================================================
+
+# Bump whenever prompt text or expected JSON changes; invalidates cached responses
+PROMPT_VERSION = "v1"
+
+
+# Per-prompt JSON schema versions, echoed by the model as "schema_version".
+# Bump one when its prompt's JSON contract changes: only that prompt's
+# cached responses are invalidated.
+PROMPT_SCHEMA_VERSIONS = {
+    "pdf_classification": "v1",
+    "image_classification": "v1",
+    "image_analysis": "v1",
+    "official_certificate": "v1",
+    "official_certificate_no_images": "v1",
+    "damage_act": "v1",
+    "photo_collection": "v1",
+    "identity_document": "v1",
+    "property_document": "v1",
+    "utility_bill": "v1",
+    "damage_photo_extraction": "v1",
+    "property_photo_extraction": "v1",
+    "document_photo_extraction": "v1",
+    "identity_photo_extraction": "v1",
+    "screenshot_extraction": "v1",
+    "image_fast": "v1",
+}
+
+
+def _schema_field(schema: str) -> str:
+    """JSON schema line declaring a prompt's schema version."""
+    return f'    "schema_version": "{PROMPT_SCHEMA_VERSIONS[schema]}",\n'
+
+
+def make_cache_key(file_hash: str, document_type: str) -> str:
+    """
+    Cache key for an LLM response to one file under the current prompts.
+
+    Includes the schema version of the prompt used for document_type, so
+    bumping one entry in PROMPT_SCHEMA_VERSIONS invalidates only that
+    prompt's responses; PROMPT_VERSION invalidates everything.
+
+    Args:
+        file_hash: Hex digest of the file contents
+        document_type: Document type, or stage label (e.g. "pdf_classification");
+            anything after a ":" is treated as a variant of that type
+
+    Returns:
+        Key string, e.g. "v1:damage_act@v1:3fa2..."
+    """
+    version = PROMPT_SCHEMA_VERSIONS.get(_schema_name(document_type))
+    if version is None:
+        return f"{PROMPT_VERSION}:{document_type}:{file_hash}"
+    return f"{PROMPT_VERSION}:{document_type}@{version}:{file_hash}"
+
+
+# =============================================================================
+# CANONICALIZATION
+# =============================================================================
+
+def _canonicalize(text: str) -> str:
+    """
+    Normalize prompt whitespace so edits can't silently change the bytes sent.
+
+    Provider prompt caches match prefixes byte-for-byte; stray trailing spaces
+    or CRLF line endings would otherwise turn into cache misses.
+    """
+    text = text.replace("\r\n", "\n")
+    lines = []
+    for line in text.split("\n"):
+        line = line.rstrip()
+        # Collapse runs of blank lines into one
+        if not line and lines and not lines[-1]:
+            continue
+        lines.append(line)
+    # One shared copy per distinct prompt text
+    return sys.intern("\n".join(lines).strip())
+
+
+def _prompt_builder(build: Callable[[], str]) -> Callable[[], str]:
+    """Decorate a prompt-returning function: canonicalize once, then cache."""
+    @lru_cache(maxsize=1)
+    @wraps(build)
+    def cached() -> str:
+        return _canonicalize(build())
+    return cached
+
+
+# =============================================================================
+# SHARED GLOSSARY
+# =============================================================================
+
+# Damage indicators shared by every prompt that judges photos
+DAMAGE_GLOSSARY = """REAL DAMAGE:
+- Holes in walls/ceiling/roof/floor
+- Collapsed structures (fallen ceiling, walls)
+- Debris, rubble, broken materials on floor
+- Burn marks, charring, fire damage
+- Shattered windows, broken glass
+- Destroyed furniture/appliances
+- Exposed wiring, pipes, insulation; water damage stains
+- Structural cracks (not cosmetic)
+
+NOT DAMAGE:
+- Clean, intact rooms and surfaces
+- Working furniture and appliances
+- Normal wear and tear, minor scratches, peeling paint
+- Clutter or mess (not destruction)"""
+
+
 # =============================================================================
 # STAGE 1: CLASSIFICATION - PDF
 # =============================================================================
 
-PDF_CLASSIFICATION_PROMPT = """You are a document classifier for a compensation claims system for displaced persons from Ukraine.
+PDF_CLASSIFICATION_PROMPT = _canonicalize("""You are a document classifier for a compensation claims system for displaced persons from Ukraine.
 
 Your task: Determine the DOCUMENT TYPE and CREATION METHOD only.
 
-## Document Categories:
-
-### 1. official_certificate
-Official documents from GOVERNMENT bodies (ДСНС, ОВА, City Council, Ministry).
-IDENTIFYING FEATURES:
-- Official LETTERHEAD at top with government body name, emblem, address
-- Organization names include: "ДСНС", "DSNS", "Державна служба", "ОВА", "Військова адміністрація", "Military Administration", "Міська рада", "City Council", "Міністерство"
-- Document REGISTRATION NUMBER (e.g., "№ 1247/03-12", "вих. № 234")
-- Signatures with OFFICIAL TITLES/RANKS (підполковник, начальник, captain, head of department)
-- Round STATE stamp with emblem or authority name
-
-### 2. damage_act  
-Damage acts created by RESIDENTS or OSBB (not government).
-IDENTIFYING FEATURES:
-- NO official government letterhead
-- Text starts with "Ми, що нижче підписалися..." or "We, the undersigned..."
-- Signatures are REGULAR CITIZENS (names only, no official titles)
-- May have OSBB stamp (круглa печатка ОСББ) - NOT government stamp
-- No official registration number
-
-### 3. photo_collection
-PDF containing ONLY PHOTOS with no or minimal document text.
-IDENTIFYING FEATURES:
-- Pages contain photographs, not document scans
-- No letterhead, no stamps, no signatures
-- May have simple captions under photos
-- Used to submit multiple damage photos as single PDF
-
-### 4. identity_document
-Passport, ID card, driver's license scans.
-IDENTIFYING FEATURES:
-- Contains person's PHOTO
-- Has document series and number
-- Contains personal data (name, birth date, etc.)
-
-### 5. property_document
-Property ownership documents, registry extracts.
-IDENTIFYING FEATURES:
-- Contains property ADDRESS
-- Has owner information
-- Registry extract number or certificate number
-- May have QR code for verification
-
-### 6. financial_statement
-Bank statements, account documents.
-IDENTIFYING FEATURES:
-- Bank/financial institution name
-- Account numbers
-- Transaction history or balance
-- Date range
-
-### 7. utility_bill
-Utility bills, proof of residence.
-IDENTIFYING FEATURES:
-- Service provider name (gas, electric, water)
-- Service address
-- Account number
-- Payment amount/period
-
-### 8. court_decision
-Court decisions, legal rulings.
-IDENTIFYING FEATURES:
-- Court name in header
-- Case number
-- "РІШЕННЯ", "ПОСТАНОВА", "УХВАЛА"
-- Judge name(s)
-
-### 9. registration_extract
-Extracts from state registries.
-IDENTIFYING FEATURES:
-- Registry name (державний реєстр)
-- Extract number
-- QR code or verification code
-- Official stamp
-
-### 10. medical_record
-Medical documents, certificates.
-IDENTIFYING FEATURES:
-- Medical institution name
-- Doctor's signature
-- Diagnosis or medical information
-- Patient name
-
-### 11. application_form
-Filled application forms.
-IDENTIFYING FEATURES:
-- Form structure with fields
-- Filled-in personal data
-- May be partially handwritten
-
-### 12. other
-Does not fit any category above.
-
-## Creation Method:
-1. **scanned** - Scanned paper document
-   Signs: paper texture, slight rotation, scan artifacts, uneven lighting, visible paper edges
-2. **digital_native** - Created digitally  
-   Signs: perfect alignment, clean background, crisp text, no paper texture
-3. **photo_converted** - Photographed document saved as PDF
-   Signs: perspective distortion, shadows, uneven lighting, background visible
-4. **screenshot** - Screenshot saved as PDF (RED FLAG!)
-   Signs: UI elements, status bar, browser chrome, screen artifacts
-5. **unknown** - Cannot determine
-
-## CRITICAL DECISION RULES:
-Rule 1: If you see GOVERNMENT LETTERHEAD (ДСНС, ОВА, etc.) → official_certificate (NOT damage_act)
-Rule 2: If document has ONLY photos with no official text → photo_collection
-Rule 3: If signatures have TITLES/RANKS → likely official_certificate
-Rule 4: If signatures are just citizen names → likely damage_act
-Rule 5: Screenshot = always add to red_flags
-
-## IMAGE DETECTION:
-
-Count any photographs, pictures, or photo-like images in the document.
-DO NOT count: logos, emblems, stamps, signatures, QR codes, form graphics.
-COUNT: photos of damage, rooms, buildings, people, attached photo evidence.
+DOCUMENT CATEGORIES:
+- official_certificate: document from a GOVERNMENT body (ДСНС/DSNS, Державна служба, ОВА, Військова адміністрація/Military Administration, Міська рада/City Council, Міністерство). Official LETTERHEAD with name/emblem/address; REGISTRATION NUMBER ("№ 1247/03-12", "вих. № 234"); signatures with OFFICIAL TITLES/RANKS (підполковник, начальник, captain, head of department); round STATE stamp.
+- damage_act: act created by RESIDENTS or OSBB. NO government letterhead; starts with "Ми, що нижче підписалися..." / "We, the undersigned..."; signatures of REGULAR CITIZENS (names only); may have OSBB stamp (кругла печатка ОСББ), not a government stamp; no registration number.
+- photo_collection: PDF with ONLY PHOTOS (not document scans); no letterhead/stamps/signatures; at most simple captions.
+- identity_document: passport, ID card, driver's license; person's PHOTO, series and number, personal data.
+- property_document: ownership document or registry extract; property ADDRESS, owner, extract/certificate number, maybe QR code.
+- financial_statement: bank/account document; institution name, account numbers, transactions or balance, date range.
+- utility_bill: proof of residence; provider (gas, electric, water), service address, account number, amount/period.
+- court_decision: court name in header, case number, "РІШЕННЯ"/"ПОСТАНОВА"/"УХВАЛА", judge name(s).
+- registration_extract: state registry extract (державний реєстр); extract number, QR/verification code, official stamp.
+- medical_record: medical institution, doctor's signature, diagnosis, patient name.
+- application_form: filled form fields with personal data, maybe handwritten.
+- other: none of the above.
+
+CREATION METHOD:
+- scanned: paper texture, slight rotation, scan artifacts, uneven lighting, paper edges
+- digital_native: perfect alignment, clean background, crisp text
+- photo_converted: photographed document; perspective distortion, shadows, background visible
+- screenshot: UI elements, status bar, browser chrome (RED FLAG!)
+- unknown: cannot determine
+
+DECISION RULES:
+1. GOVERNMENT LETTERHEAD (ДСНС, ОВА, etc.) → official_certificate, never damage_act
+2. ONLY photos, no official text → photo_collection
+3. Screenshot → always add to red_flags
+
+IMAGE DETECTION: count photographs of damage, rooms, buildings, people or attached photo evidence. Do NOT count logos, emblems, stamps, signatures, QR codes or form graphics.
 
 Respond ONLY with JSON:
 {
-    "document_type": "<category>",
+""" + _schema_field("pdf_classification") + """    "document_type": "<category>",
     "document_type_ua": "<тип українською>",
     "creation_method": "<method>",
     "brief_description": "<one sentence describing what you see>",
@@ -147,100 +179,34 @@ Respond ONLY with JSON:
     "classification_confidence": <0.0-1.0>,
     "classification_reasoning": "<why you chose this type>",
     "red_flags": ["<only if screenshot or obvious problems>"]
-}"""
+}""")
 
 
 # =============================================================================
 # STAGE 1: CLASSIFICATION - IMAGE
 # =============================================================================
 
-IMAGE_CLASSIFICATION_PROMPT = """You are an image classifier for a compensation claims system for displaced persons from Ukraine.
-
-Your task: Determine the IMAGE CATEGORY and what it shows.
-
-## Image Categories:
-
-### 1. damage_photo
-Photo showing DAMAGE to property (building, apartment, house, vehicle).
-IDENTIFYING FEATURES:
-- Visible destruction: holes, cracks, collapsed structures
-- Debris, broken glass, burn marks
-- Damaged furniture or appliances
-- War-related damage (shelling, explosions)
-
-### 2. property_exterior
-Photo of building/property EXTERIOR (may or may not show damage).
-IDENTIFYING FEATURES:
-- Building facade, entrance, yard
-- Street view of property
-- May show address or building number
-
-### 3. property_interior
-Photo of building/property INTERIOR (may or may not show damage).
-IDENTIFYING FEATURES:
-- Rooms, corridors, stairs
-- Furniture, appliances
-- Interior condition documentation
-
-### 4. document_photo
-Photo of a PAPER DOCUMENT (not scan, actual photo).
-IDENTIFYING FEATURES:
-- Paper document visible in frame
-- May have perspective distortion
-- Background visible around document
-- Shadows, uneven lighting
-
-### 5. identity_photo
-Photo for identification purposes or photo of ID document.
-IDENTIFYING FEATURES:
-- Person's face visible
-- Or: ID card/passport photographed
-
-### 6. before_after
-Photo showing property BEFORE damage (for comparison).
-IDENTIFYING FEATURES:
-- Clean, intact property
-- No visible damage
-- Often older photo quality
-- Context suggests "before" state
-
-### 7. screenshot
-Screenshot from phone/computer - RED FLAG!
-IDENTIFYING FEATURES:
-- Status bar visible (time, battery, signal)
-- Browser chrome or app UI
-- Screen interface elements
-- Perfect rectangular edges
-
-### 8. other
-Does not fit categories above.
-
-## CRITICAL RULES:
-Rule 1: If you see STATUS BAR, BROWSER UI, or APP INTERFACE → screenshot (RED FLAG)
-Rule 2: Analyze ACTUAL content - what does the photo SHOW?
-Rule 3: For damage: describe SPECIFIC damage visible (holes, cracks, debris)
-Rule 4: If photo shows clean/intact property → NOT damage_photo (unless context is "before")
+IMAGE_CLASSIFICATION_PROMPT = _canonicalize("""You are an image classifier for a compensation claims system for displaced persons from Ukraine.
 
-## DAMAGE VERIFICATION:
+Your task: Determine the IMAGE CATEGORY and what it ACTUALLY shows.
 
-REAL DAMAGE looks like:
-- Holes in walls/ceiling/roof
-- Collapsed structures
-- Debris and rubble
-- Burn marks, fire damage
-- Shattered windows
-- Destroyed furniture/appliances
+IMAGE CATEGORIES:
+- damage_photo: visible DAMAGE to a building, apartment, house or vehicle (see glossary below)
+- property_exterior: building facade, entrance, yard or street view; may show address; damaged or not
+- property_interior: rooms, corridors, stairs, furniture; damaged or not
+- document_photo: photo (not scan) of a PAPER DOCUMENT; perspective distortion, background, shadows
+- identity_photo: person's face, or a photographed ID card/passport
+- before_after: intact property BEFORE damage, for comparison
+- screenshot: status bar, browser chrome or app UI, perfect rectangular edges (RED FLAG!)
+- other: none of the above
 
-NOT DAMAGE (don't classify as damage_photo):
-- Clean, normal rooms
-- Intact furniture
-- Working appliances
-- Minor wear and tear
-- Mess/clutter (not destruction)
+""" + DAMAGE_GLOSSARY + """
+
+Clean/intact property is NOT damage_photo (unless context is "before"). For damage, describe the SPECIFIC damage visible.
 
 Respond ONLY with JSON:
 {
-    "category": "<category from list>",
+""" + _schema_field("image_classification") + """    "category": "<category from list>",
     "category_ua": "<категорія українською>",
     "brief_description": "<what the image shows>",
     "shows_damage": <true/false>,
@@ -249,63 +215,33 @@ Respond ONLY with JSON:
     "classification_confidence": <0.0-1.0>,
     "classification_reasoning": "<why you chose this category>",
     "red_flags": ["<only if screenshot or fake/stock photo detected>"]
-}"""
+}""")
 
 
 # =============================================================================
 # STAGE 2: IMAGE ANALYSIS (independent from text)
 # =============================================================================
 
-IMAGE_ANALYSIS_PROMPT = """You are analyzing IMAGES/PHOTOS extracted from a document.
+IMAGE_ANALYSIS_PROMPT = _canonicalize("""You are analyzing IMAGES/PHOTOS extracted from a document.
 
 IMPORTANT: You are seeing ONLY the images, not the document text.
-Your task: Describe what each image shows OBJECTIVELY, without any context from document text.
-
-## For EACH image, determine:
-
-### 1. Content Type:
-- damage_photo: Shows property damage (holes, cracks, debris, destruction)
-- room_interior: Shows room/interior (may or may not have damage)
-- building_exterior: Shows building from outside
-- document_scan: Shows a scanned document or certificate
-- person_photo: Shows a person (ID photo, portrait)
-- other: Anything else
-
-### 2. If shows property/room - Damage Assessment:
+Describe what each image shows OBJECTIVELY, without any context from document text.
 
-REAL DAMAGE indicators:
-- Structural holes (through walls, ceiling, floor)
-- Collapsed structures (fallen ceiling, walls)
-- Debris, rubble, broken materials on floor
-- Burn marks, charring, fire damage
-- Shattered windows, broken glass
-- Exposed wiring, pipes, insulation
-- Water damage stains, flooding evidence
-- Cracks in walls/ceiling (structural, not cosmetic)
+For EACH image determine:
+1. Content type: damage_photo, room_interior, building_exterior, document_scan, person_photo or other
+2. Damage assessment (property/room photos):
 
-NOT DAMAGE (normal condition):
-- Clean, intact surfaces
-- Working furniture and appliances
-- Normal wear and tear
-- Clutter or mess (not destruction)
-- Minor scratches or scuffs
-- Peeling paint (age, not damage)
-
-### 3. Authenticity Check:
-- Is this a real photo or screenshot?
-- Signs of editing or manipulation?
-- Stock photo watermarks?
-- Inconsistent lighting or shadows?
+""" + DAMAGE_GLOSSARY + """
 
-## Response format:
+3. Authenticity: real photo or screenshot? Editing or manipulation? Stock photo watermarks? Inconsistent lighting or shadows?
 
 Respond ONLY with JSON:
 {
-    "images_analyzed": <number>,
+""" + _schema_field("image_analysis") + """    "images_analyzed": <number>,
     "images": [
         {
             "image_index": 1,
-            "content_type": "<damage_photo/room_interior/building_exterior/document_scan/person_photo/other>",
+            "content_type": "<content type>",
             "description": "<detailed description of what you see>",
             "shows_damage": <true/false>,
             "damage_details": {
@@ -330,18 +266,18 @@ Respond ONLY with JSON:
         "images_appear_consistent": <true/false - same location/property?>,
         "authenticity_score": <0.0-1.0>
     }
-}"""
+}""")
 
 
 # =============================================================================
 # STAGE 3: EXTRACTION PROMPTS (per document type)
 # =============================================================================
 
-OFFICIAL_CERTIFICATE_PROMPT = """You are extracting details from an OFFICIAL GOVERNMENT CERTIFICATE (dovідka, act, certificate from ДСНС, ОВА, or other government body).
+_OFFICIAL_CERTIFICATE_INTRO = """You are extracting details from an OFFICIAL GOVERNMENT CERTIFICATE (dovідka, act, certificate from ДСНС, ОВА, or other government body).
 
-{image_analysis_section}
+"""
 
-## REQUIRED ELEMENTS (must be present):
+_OFFICIAL_REQUIRED_ELEMENTS = """## REQUIRED ELEMENTS (must be present):
 1. ✓ Official letterhead with government body name
 2. ✓ Document registration number and date
 3. ✓ Official round stamp (державна печатка)
@@ -357,9 +293,9 @@ OFFICIAL_CERTIFICATE_PROMPT = """You are extracting details from an OFFICIAL GOV
 ### Document Details:
 - Document number (номер документа)
 - Document date (дата)
-- What is the document about? What damage/situation is described in TEXT?
+"""
 
-### Stamps:
+_STAMP_CHECKLIST = """### Stamps:
 - Is there a round official stamp visible?
 - Can you read the stamp text? What authority?
 - Location on page (usually bottom, near signatures)
@@ -369,34 +305,31 @@ OFFICIAL_CERTIFICATE_PROMPT = """You are extracting details from an OFFICIAL GOV
 - Are there titles/ranks next to signatures? (підполковник, начальник, etc.)
 - Are signatures handwritten marks or just printed lines?
 
-### CROSS-VALIDATION (if image analysis provided):
-Compare TEXT CLAIMS with IMAGE ANALYSIS RESULTS.
+"""
+
+_CROSS_VALIDATION_SECTION = """### CROSS-VALIDATION (if image analysis provided):
+Compare TEXT CLAIMS with IMAGE ANALYSIS RESULTS (given at the end of this prompt).
 - What does the TEXT claim about damage?
 - What do IMAGES actually show (from image_analysis)?
 - Do they MATCH or MISMATCH?
+"""
 
-MISMATCH EXAMPLES (red_flag):
-- Text claims "roof destroyed" but images show intact ceiling
-- Text claims "severe fire damage" but images show no burn marks
-- Text describes damage but images show clean, intact rooms
-- Text claims specific damage type but images show different damage
-
-## VALIDATION RULES:
+_OFFICIAL_VALIDATION_RULES_HEAD = """## VALIDATION RULES:
 - Missing letterhead → red_flag
-- Missing stamp → red_flag  
+- Missing stamp → red_flag
 - Missing signature → red_flag
 - No document number → warning
-- Images don't match text claims → red_flag (CRITICAL!)
-- Digital document (not scanned) → warning only
+"""
 
-Respond ONLY with JSON:
-{
-    "issuing_authority": "<government body name>",
+_JSON_OUTPUT_HEADER = "Respond ONLY with JSON:\n"
+
+_OFFICIAL_JSON_FIELDS = """    "issuing_authority": "<government body name>",
     "document_number": "<number or null>",
     "document_date": "<YYYY-MM-DD or null>",
     "document_subject": "<what document is about>",
-    "text_damage_claims": "<what the TEXT says about damage>",
-    "has_letterhead": <true/false>,
+"""
+
+_OFFICIAL_JSON_ELEMENTS = """    "has_letterhead": <true/false>,
     "letterhead_authority": "<organization from letterhead>",
     "has_stamp": <true/false>,
     "stamp_authority": "<text from stamp if readable>",
@@ -405,83 +338,81 @@ Respond ONLY with JSON:
     "signatures_count": <number>,
     "signatures_have_titles": <true/false>,
     "signatures_details": ["<title/name for each>"],
-    "content_summary": "<key information from document TEXT>",
-    "cross_validation": {
+"""
+
+_CROSS_VALIDATION_JSON = """    "cross_validation": {
         "text_claims": "<what text claims about damage>",
         "image_shows": "<what images actually show - from image_analysis>",
         "match_status": "<full_match/partial_match/mismatch/no_images>",
         "mismatch_details": "<specific discrepancies if any, or null>"
     },
-    "red_flags": ["<missing elements, mismatches, problems>"],
-    "warnings": ["<minor issues>"],
-    "extraction_confidence": <0.0-1.0>
-}"""
-
-
-OFFICIAL_CERTIFICATE_PROMPT_NO_IMAGES = """You are extracting details from an OFFICIAL GOVERNMENT CERTIFICATE (dovідka, act, certificate from ДСНС, ОВА, or other government body).
-
-This document has NO PHOTOS - analyze text and official elements only.
-
-## REQUIRED ELEMENTS (must be present):
-1. ✓ Official letterhead with government body name
-2. ✓ Document registration number and date
-3. ✓ Official round stamp (державна печатка)
-4. ✓ Signature(s) with titles/positions
-5. ✓ Issuing authority name
+"""
 
-## EXTRACTION CHECKLIST:
 
-### Letterhead:
-- Is there an official header? (government body name, address, contacts)
-- What organization is shown?
+@_prompt_builder
+def _official_certificate_prompt() -> str:
+    return (
+        _OFFICIAL_CERTIFICATE_INTRO
+        + _OFFICIAL_REQUIRED_ELEMENTS
+        + "- What is the document about? What damage/situation is described in TEXT?\n\n"
+        + _STAMP_CHECKLIST
+        + _CROSS_VALIDATION_SECTION
+        + """
+MISMATCH EXAMPLES (red_flag):
+- Text claims "roof destroyed" but images show intact ceiling
+- Text claims "severe fire damage" but images show no burn marks
+- Text describes damage but images show clean, intact rooms
+- Text claims specific damage type but images show different damage
 
-### Document Details:
-- Document number (номер документа)
-- Document date (дата)
-- What is the document about?
+"""
+        + _OFFICIAL_VALIDATION_RULES_HEAD
+        + """- Images don't match text claims → red_flag (CRITICAL!)
+- Digital document (not scanned) → warning only
 
-### Stamps:
-- Is there a round official stamp visible?
-- Can you read the stamp text? What authority?
-- Location on page (usually bottom, near signatures)
+"""
+        + _JSON_OUTPUT_HEADER
+        + "{\n"
+        + _schema_field("official_certificate")
+        + _OFFICIAL_JSON_FIELDS
+        + """    "text_damage_claims": "<what the TEXT says about damage>",\n"""
+        + _OFFICIAL_JSON_ELEMENTS
+        + """    "content_summary": "<key information from document TEXT>",\n"""
+        + _CROSS_VALIDATION_JSON
+        + """    "red_flags": ["<missing elements, mismatches, problems>"],
+    "warnings": ["<minor issues>"],
+    "extraction_confidence": <0.0-1.0>
+}"""
+    )
 
-### Signatures:
-- How many signatures?
-- Are there titles/ranks next to signatures? (підполковник, начальник, etc.)
-- Are signatures handwritten marks or just printed lines?
 
-## VALIDATION RULES:
-- Missing letterhead → red_flag
-- Missing stamp → red_flag  
-- Missing signature → red_flag
-- No document number → warning
-- Digital document (not scanned) → warning only
+@_prompt_builder
+def _official_certificate_prompt_no_images() -> str:
+    return (
+        _OFFICIAL_CERTIFICATE_INTRO
+        + "This document has NO PHOTOS - analyze text and official elements only.\n\n"
+        + _OFFICIAL_REQUIRED_ELEMENTS
+        + "- What is the document about?\n\n"
+        + _STAMP_CHECKLIST
+        + _OFFICIAL_VALIDATION_RULES_HEAD
+        + """- Digital document (not scanned) → warning only
 
-Respond ONLY with JSON:
-{
-    "issuing_authority": "<government body name>",
-    "document_number": "<number or null>",
-    "document_date": "<YYYY-MM-DD or null>",
-    "document_subject": "<what document is about>",
-    "has_letterhead": <true/false>,
-    "letterhead_authority": "<organization from letterhead>",
-    "has_stamp": <true/false>,
-    "stamp_authority": "<text from stamp if readable>",
-    "stamp_location": "<where on page>",
-    "has_signatures": <true/false>,
-    "signatures_count": <number>,
-    "signatures_have_titles": <true/false>,
-    "signatures_details": ["<title/name for each>"],
-    "content_summary": "<key information from document>",
+"""
+        + _JSON_OUTPUT_HEADER
+        + "{\n"
+        + _schema_field("official_certificate_no_images")
+        + _OFFICIAL_JSON_FIELDS
+        + _OFFICIAL_JSON_ELEMENTS
+        + """    "content_summary": "<key information from document>",
     "red_flags": ["<missing required elements or problems>"],
     "warnings": ["<minor issues>"],
     "extraction_confidence": <0.0-1.0>
 }"""
+    )
 
 
-DAMAGE_ACT_PROMPT = """You are extracting details from a DAMAGE ACT created by RESIDENTS or OSBB (not a government document).
-
-{image_analysis_section}
+@_prompt_builder
+def _damage_act_prompt() -> str:
+    return """You are extracting details from a DAMAGE ACT created by RESIDENTS or OSBB (not a government document).
 
 ## EXPECTED ELEMENTS:
 1. ✓ List of witnesses/signatories (usually 2-3 people)
@@ -512,12 +443,7 @@ DAMAGE_ACT_PROMPT = """You are extracting details from a DAMAGE ACT created by R
 - Is there an OSBB stamp? (acceptable but not required)
 - Is there a government stamp? (unusual for resident act)
 
-### CROSS-VALIDATION (if image analysis provided):
-Compare TEXT CLAIMS with IMAGE ANALYSIS RESULTS.
-- What does the TEXT claim about damage?
-- What do IMAGES actually show (from image_analysis)?
-- Do they MATCH or MISMATCH?
-
+""" + _CROSS_VALIDATION_SECTION + """
 ## VALIDATION RULES:
 - Fewer than 2 signatures → warning
 - No signatures at all → red_flag
@@ -525,9 +451,8 @@ Compare TEXT CLAIMS with IMAGE ANALYSIS RESULTS.
 - Government stamp present → warning (unusual, verify if really resident act)
 - Images don't match text claims → red_flag (CRITICAL!)
 
-Respond ONLY with JSON:
-{
-    "property_address": "<address or null>",
+""" + _JSON_OUTPUT_HEADER + """{
+""" + _schema_field("damage_act") + """    "property_address": "<address or null>",
     "owner_name": "<name or null>",
     "damage_date": "<YYYY-MM-DD when damage occurred, or null>",
     "act_date": "<YYYY-MM-DD when act was created, or null>",
@@ -541,19 +466,15 @@ Respond ONLY with JSON:
     "osbb_name": "<OSBB name if visible>",
     "has_government_stamp": <true/false>,
     "content_summary": "<key information from TEXT>",
-    "cross_validation": {
-        "text_claims": "<what text claims about damage>",
-        "image_shows": "<what images actually show - from image_analysis>",
-        "match_status": "<full_match/partial_match/mismatch/no_images>",
-        "mismatch_details": "<specific discrepancies if any, or null>"
-    },
-    "red_flags": ["<problems found, including mismatches>"],
+""" + _CROSS_VALIDATION_JSON + """    "red_flags": ["<problems found, including mismatches>"],
     "warnings": ["<minor issues>"],
     "extraction_confidence": <0.0-1.0>
 }"""
 
 
-PHOTO_COLLECTION_PROMPT = """You are analyzing a PDF that contains a COLLECTION OF PHOTOS (not a document scan).
+@_prompt_builder
+def _photo_collection_prompt() -> str:
+    return """You are analyzing a PDF that contains a COLLECTION OF PHOTOS (not a document scan).
 
 ## YOUR TASK:
 1. Count the photos
@@ -569,19 +490,7 @@ For EACH photo, describe:
 
 ## DAMAGE VERIFICATION:
 
-REAL DAMAGE looks like:
-- Broken/collapsed walls or ceiling
-- Holes, cracks in structures
-- Debris on floor
-- Burn marks, fire damage
-- Shattered windows
-- Destroyed furniture
-
-NOT DAMAGE:
-- Clean, intact rooms
-- Normal furniture
-- Working appliances
-- Minor wear and tear
+""" + DAMAGE_GLOSSARY + """
 
 ## CHECK FOR:
 - Are these original photos or screenshots? (screenshots = red_flag)
@@ -590,7 +499,7 @@ NOT DAMAGE:
 
 Respond ONLY with JSON:
 {
-    "photo_count": <number>,
+""" + _schema_field("photo_collection") + """    "photo_count": <number>,
     "photos_analysis": [
         {
             "photo_number": 1,
@@ -611,7 +520,9 @@ Respond ONLY with JSON:
 }"""
 
 
-IDENTITY_DOCUMENT_PROMPT = """You are extracting details from an IDENTITY DOCUMENT (passport, ID card, driver's license).
+@_prompt_builder
+def _identity_document_prompt() -> str:
+    return """You are extracting details from an IDENTITY DOCUMENT (passport, ID card, driver's license).
 
 ## EXTRACTION CHECKLIST:
 
@@ -638,7 +549,7 @@ IDENTITY_DOCUMENT_PROMPT = """You are extracting details from an IDENTITY DOCUME
 
 Respond ONLY with JSON:
 {
-    "document_subtype": "<passport/id_card/driver_license/other>",
+""" + _schema_field("identity_document") + """    "document_subtype": "<passport/id_card/driver_license/other>",
     "country": "<issuing country>",
     "holder_name": "<full name or null>",
     "date_of_birth": "<YYYY-MM-DD or null>",
@@ -654,7 +565,9 @@ Respond ONLY with JSON:
 }"""
 
 
-PROPERTY_DOCUMENT_PROMPT = """You are extracting details from a PROPERTY DOCUMENT (ownership certificate, registry extract).
+@_prompt_builder
+def _property_document_prompt() -> str:
+    return """You are extracting details from a PROPERTY DOCUMENT (ownership certificate, registry extract).
 
 ## EXTRACTION CHECKLIST:
 
@@ -685,7 +598,7 @@ PROPERTY_DOCUMENT_PROMPT = """You are extracting details from a PROPERTY DOCUMEN
 
 Respond ONLY with JSON:
 {
-    "property_address": "<address>",
+""" + _schema_field("property_document") + """    "property_address": "<address>",
     "property_type": "<apartment/house/land/commercial/other>",
     "property_area": "<size with units or null>",
     "owner_names": ["<list of owners>"],
@@ -702,7 +615,9 @@ Respond ONLY with JSON:
 }"""
 
 
-UTILITY_BILL_PROMPT = """You are extracting details from a UTILITY BILL.
+@_prompt_builder
+def _utility_bill_prompt() -> str:
+    return """You are extracting details from a UTILITY BILL.
 
 ## EXTRACTION CHECKLIST:
 
@@ -729,7 +644,7 @@ Note: Utility bills often don't have stamps/signatures - this is normal.
 
 Respond ONLY with JSON:
 {
-    "provider_name": "<company name>",
+""" + _schema_field("utility_bill") + """    "provider_name": "<company name>",
     "service_type": "<gas/electricity/water/heating/other>",
     "service_address": "<address>",
     "account_number": "<number or null>",
@@ -747,7 +662,9 @@ Respond ONLY with JSON:
 # STAGE 2: EXTRACTION PROMPTS - IMAGE
 # =============================================================================
 
-DAMAGE_PHOTO_EXTRACTION_PROMPT = """You are analyzing a DAMAGE PHOTO for a compensation claim.
+@_prompt_builder
+def _damage_photo_extraction_prompt() -> str:
+    return """You are analyzing a DAMAGE PHOTO for a compensation claim.
 
 ## YOUR TASK:
 1. Describe the damage in detail
@@ -783,7 +700,7 @@ DAMAGE_PHOTO_EXTRACTION_PROMPT = """You are analyzing a DAMAGE PHOTO for a compe
 
 Respond ONLY with JSON:
 {
-    "damage_type": ["<list of damage types: hole, crack, collapse, fire, debris, broken_window, etc>"],
+""" + _schema_field("damage_photo_extraction") + """    "damage_type": ["<list of damage types: hole, crack, collapse, fire, debris, broken_window, etc>"],
     "damaged_objects": ["<what is damaged: ceiling, wall, floor, furniture, appliance, etc>"],
     "location_in_building": "<room or area>",
     "damage_cause": "<shelling/fire/explosion/unknown>",
@@ -798,7 +715,9 @@ Respond ONLY with JSON:
 }"""
 
 
-PROPERTY_PHOTO_EXTRACTION_PROMPT = """You are analyzing a PROPERTY PHOTO (exterior or interior).
+@_prompt_builder
+def _property_photo_extraction_prompt() -> str:
+    return """You are analyzing a PROPERTY PHOTO (exterior or interior).
 
 ## YOUR TASK:
 1. Describe what is shown
@@ -825,7 +744,7 @@ PROPERTY_PHOTO_EXTRACTION_PROMPT = """You are analyzing a PROPERTY PHOTO (exteri
 
 Respond ONLY with JSON:
 {
-    "view_type": "<exterior/interior>",
+""" + _schema_field("property_photo_extraction") + """    "view_type": "<exterior/interior>",
     "building_type": "<apartment/house/commercial/other>",
     "area_shown": "<specific area or room>",
     "condition": "<good/fair/poor/damaged>",
@@ -840,7 +759,9 @@ Respond ONLY with JSON:
 }"""
 
 
-DOCUMENT_PHOTO_EXTRACTION_PROMPT = """You are analyzing a PHOTO OF A DOCUMENT (not a scan, an actual photograph).
+@_prompt_builder
+def _document_photo_extraction_prompt() -> str:
+    return """You are analyzing a PHOTO OF A DOCUMENT (not a scan, an actual photograph).
 
 ## YOUR TASK:
 1. Identify what document is photographed
@@ -871,7 +792,7 @@ DOCUMENT_PHOTO_EXTRACTION_PROMPT = """You are analyzing a PHOTO OF A DOCUMENT (n
 
 Respond ONLY with JSON:
 {
-    "document_type_visible": "<what document appears to be>",
+""" + _schema_field("document_photo_extraction") + """    "document_type_visible": "<what document appears to be>",
     "language": "<document language>",
     "text_readable": <true/false/partial>,
     "has_visible_stamp": <true/false>,
@@ -888,7 +809,9 @@ Respond ONLY with JSON:
 }"""
 
 
-IDENTITY_PHOTO_EXTRACTION_PROMPT = """You are analyzing an IDENTITY PHOTO or photo of an ID document.
+@_prompt_builder
+def _identity_photo_extraction_prompt() -> str:
+    return """You are analyzing an IDENTITY PHOTO or photo of an ID document.
 
 ## YOUR TASK:
 1. Determine if this is a portrait photo or photo of ID document
@@ -923,7 +846,7 @@ IDENTITY_PHOTO_EXTRACTION_PROMPT = """You are analyzing an IDENTITY PHOTO or pho
 
 Respond ONLY with JSON:
 {
-    "photo_type": "<portrait/id_document_photo>",
+""" + _schema_field("identity_photo_extraction") + """    "photo_type": "<portrait/id_document_photo>",
     "face_visible": <true/false>,
     "face_quality": "<good/acceptable/poor/not_applicable>",
     "document_type_if_id": "<passport/id_card/driver_license/other/null>",
@@ -945,7 +868,9 @@ Respond ONLY with JSON:
 }"""
 
 
-SCREENSHOT_EXTRACTION_PROMPT = """You are analyzing what appears to be a SCREENSHOT.
+@_prompt_builder
+def _screenshot_extraction_prompt() -> str:
+    return """You are analyzing what appears to be a SCREENSHOT.
 
 Screenshots are generally NOT ACCEPTED as valid evidence. Document what you see.
 
@@ -956,7 +881,7 @@ Screenshots are generally NOT ACCEPTED as valid evidence. Document what you see.
 
 Respond ONLY with JSON:
 {
-    "screenshot_source": "<app/website/system>",
+""" + _schema_field("screenshot_extraction") + """    "screenshot_source": "<app/website/system>",
     "content_shown": "<what is displayed>",
     "contains_relevant_info": <true/false>,
     "info_description": "<what relevant info if any>",
@@ -966,41 +891,140 @@ Respond ONLY with JSON:
     "extraction_confidence": <0.0-1.0>
 }"""
 
+# =============================================================================
+# IMAGE FAST PATH: CLASSIFICATION + EXTRACTION IN ONE CALL
+# =============================================================================
+
+IMAGE_FAST_PROMPT = _canonicalize("""You are an image analyst for a compensation claims system for displaced persons from Ukraine.
+
+Your task, in ONE pass: determine the IMAGE CATEGORY, then extract the details relevant to that category.
+
+IMAGE CATEGORIES:
+- damage_photo: visible DAMAGE to a building, apartment, house or vehicle (see glossary below)
+- property_exterior: building facade, entrance, yard or street view; may show address; damaged or not
+- property_interior: rooms, corridors, stairs, furniture; damaged or not
+- document_photo: photo (not scan) of a PAPER DOCUMENT; perspective distortion, background, shadows
+- identity_photo: person's face, or a photographed ID card/passport
+- before_after: intact property BEFORE damage, for comparison
+- screenshot: status bar, browser chrome or app UI, perfect rectangular edges (RED FLAG!)
+- other: none of the above
+
+""" + DAMAGE_GLOSSARY + """
+
+Clean/intact property is NOT damage_photo (unless context is "before"). For damage, describe the SPECIFIC damage visible.
+
+EXTRACTION (fill what applies to the chosen category, null/empty otherwise):
+- Damage: damage types, damaged objects, room/area, likely cause, severity
+- Property: property type, condition, visible address
+- Document photo: document type, visible date, stamp/signature/letterhead
+- Authenticity: stock photo watermarks, staged composition, inconsistent lighting or perspective
+
+Respond ONLY with JSON:
+{
+""" + _schema_field("image_fast") + """    "category": "<category from list>",
+    "category_ua": "<категорія українською>",
+    "brief_description": "<what the image shows>",
+    "shows_damage": <true/false>,
+    "damage_description": "<specific damage visible, or null>",
+    "damage_severity": "<none/minor/moderate/severe/catastrophic or null>",
+    "classification_confidence": <0.0-1.0>,
+    "classification_reasoning": "<why you chose this category>",
+    "damage_type": ["<hole, crack, collapse, fire, debris, broken_window, etc>"],
+    "damaged_objects": ["<ceiling, wall, floor, furniture, appliance, etc>"],
+    "location_in_building": "<room or area, or null>",
+    "damage_cause": "<shelling/fire/explosion/unknown, or null>",
+    "property_type": "<apartment/house/commercial/other, or null>",
+    "condition": "<intact/damaged/destroyed, or null>",
+    "visible_address": "<address if visible, or null>",
+    "document_type_visible": "<type of photographed document, or null>",
+    "text_readable": <true/false>,
+    "document_date_visible": "<date visible on a photographed document, or null>",
+    "has_visible_stamp": <true/false>,
+    "has_visible_signature": <true/false>,
+    "appears_authentic": <true/false>,
+    "authenticity_concerns": ["<any concerns or empty list>"],
+    "content_summary": "<brief summary>",
+    "red_flags": ["<screenshot, fake/stock photo or other problems>"],
+    "warnings": ["<minor issues>"],
+    "extraction_confidence": <0.0-1.0>
+}""")
+
+
 # =============================================================================
 # PROMPT MAPPINGS
 # =============================================================================
 
-# PDF document type → extraction prompt
+# PDF document type → extraction prompt builder
 PDF_EXTRACTION_PROMPTS = {
-    "official_certificate": OFFICIAL_CERTIFICATE_PROMPT,
-    "damage_act": DAMAGE_ACT_PROMPT,
-    "photo_collection": PHOTO_COLLECTION_PROMPT,
-    "identity_document": IDENTITY_DOCUMENT_PROMPT,
-    "property_document": PROPERTY_DOCUMENT_PROMPT,
-    "utility_bill": UTILITY_BILL_PROMPT,
-    "court_decision": OFFICIAL_CERTIFICATE_PROMPT,
-    "registration_extract": OFFICIAL_CERTIFICATE_PROMPT,
-    "medical_record": OFFICIAL_CERTIFICATE_PROMPT,
-    "financial_statement": UTILITY_BILL_PROMPT,
-    "application_form": DAMAGE_ACT_PROMPT,
+    "official_certificate": _official_certificate_prompt,
+    "damage_act": _damage_act_prompt,
+    "photo_collection": _photo_collection_prompt,
+    "identity_document": _identity_document_prompt,
+    "property_document": _property_document_prompt,
+    "utility_bill": _utility_bill_prompt,
+    "court_decision": _official_certificate_prompt,
+    "registration_extract": _official_certificate_prompt,
+    "medical_record": _official_certificate_prompt,
+    "financial_statement": _utility_bill_prompt,
+    "application_form": _damage_act_prompt,
     "other": None,
 }
 
-# Image category → extraction prompt
+# Image category → extraction prompt builder
 IMAGE_EXTRACTION_PROMPTS = {
-    "damage_photo": DAMAGE_PHOTO_EXTRACTION_PROMPT,
-    "property_exterior": PROPERTY_PHOTO_EXTRACTION_PROMPT,
-    "property_interior": PROPERTY_PHOTO_EXTRACTION_PROMPT,
-    "document_photo": DOCUMENT_PHOTO_EXTRACTION_PROMPT,
-    "identity_photo": IDENTITY_PHOTO_EXTRACTION_PROMPT,
-    "before_after": PROPERTY_PHOTO_EXTRACTION_PROMPT,
-    "screenshot": SCREENSHOT_EXTRACTION_PROMPT,
+    "damage_photo": _damage_photo_extraction_prompt,
+    "property_exterior": _property_photo_extraction_prompt,
+    "property_interior": _property_photo_extraction_prompt,
+    "document_photo": _document_photo_extraction_prompt,
+    "identity_photo": _identity_photo_extraction_prompt,
+    "before_after": _property_photo_extraction_prompt,
+    "screenshot": _screenshot_extraction_prompt,
     "other": None,
 }
 
 # Backward compatibility alias
 EXTRACTION_PROMPTS = PDF_EXTRACTION_PROMPTS
 
+# Cache labels that reuse another prompt's schema
+_LABEL_SCHEMAS = {
+    "image_analysis_fallback": "image_analysis",
+}
+
+
+def _schema_name(document_type: str) -> str:
+    """PROMPT_SCHEMA_VERSIONS key for a document type or stage label."""
+    base = document_type.split(":", 1)[0]
+    builder = PDF_EXTRACTION_PROMPTS.get(base) or IMAGE_EXTRACTION_PROMPTS.get(base)
+    if builder is not None:
+        # _damage_act_prompt -> damage_act
+        return builder.__name__[1:].removesuffix("_prompt")
+    return _LABEL_SCHEMAS.get(base, base)
+
+
+# Former module-level constants, now built on first access
+_LAZY_PROMPTS = {
+    "OFFICIAL_CERTIFICATE_PROMPT": _official_certificate_prompt,
+    "OFFICIAL_CERTIFICATE_PROMPT_NO_IMAGES": _official_certificate_prompt_no_images,
+    "DAMAGE_ACT_PROMPT": _damage_act_prompt,
+    "PHOTO_COLLECTION_PROMPT": _photo_collection_prompt,
+    "IDENTITY_DOCUMENT_PROMPT": _identity_document_prompt,
+    "PROPERTY_DOCUMENT_PROMPT": _property_document_prompt,
+    "UTILITY_BILL_PROMPT": _utility_bill_prompt,
+    "DAMAGE_PHOTO_EXTRACTION_PROMPT": _damage_photo_extraction_prompt,
+    "PROPERTY_PHOTO_EXTRACTION_PROMPT": _property_photo_extraction_prompt,
+    "DOCUMENT_PHOTO_EXTRACTION_PROMPT": _document_photo_extraction_prompt,
+    "IDENTITY_PHOTO_EXTRACTION_PROMPT": _identity_photo_extraction_prompt,
+    "SCREENSHOT_EXTRACTION_PROMPT": _screenshot_extraction_prompt,
+}
+
+
+def __getattr__(name: str):
+    """Resolve old prompt constant names (e.g. DAMAGE_ACT_PROMPT) lazily."""
+    builder = _LAZY_PROMPTS.get(name)
+    if builder is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return builder()
+
 
 # =============================================================================
 # GETTER FUNCTIONS
@@ -1028,12 +1052,14 @@ def get_classification_prompt(file_type: str) -> str:
 
 def get_pdf_extraction_prompt(document_type: str) -> str | None:
     """Get extraction prompt for PDF document type."""
-    return PDF_EXTRACTION_PROMPTS.get(document_type)
+    builder = PDF_EXTRACTION_PROMPTS.get(document_type)
+    return builder() if builder else None
 
 
 def get_image_extraction_prompt(category: str) -> str | None:
     """Get extraction prompt for image category."""
-    return IMAGE_EXTRACTION_PROMPTS.get(category)
+    builder = IMAGE_EXTRACTION_PROMPTS.get(category)
+    return builder() if builder else None
 
 
 def get_extraction_prompt(type_or_category: str, file_type: str = "pdf") -> str | None:
@@ -1048,12 +1074,17 @@ def get_extraction_prompt(type_or_category: str, file_type: str = "pdf") -> str
         Extraction prompt string or None
     """
     if file_type == "pdf":
-        return PDF_EXTRACTION_PROMPTS.get(type_or_category)
+        return get_pdf_extraction_prompt(type_or_category)
     elif file_type == "image":
-        return IMAGE_EXTRACTION_PROMPTS.get(type_or_category)
+        return get_image_extraction_prompt(type_or_category)
     else:
         # Try both mappings
-        return PDF_EXTRACTION_PROMPTS.get(type_or_category) or IMAGE_EXTRACTION_PROMPTS.get(type_or_category)
+        return get_pdf_extraction_prompt(type_or_category) or get_image_extraction_prompt(type_or_category)
+
+
+def get_image_fast_prompt() -> str:
+    """Get the combined image classification + extraction prompt."""
+    return IMAGE_FAST_PROMPT
 
 
 def get_image_analysis_prompt() -> str:
@@ -1061,6 +1092,101 @@ def get_image_analysis_prompt() -> str:
     return IMAGE_ANALYSIS_PROMPT
 
 
+_IMG_HEADER = """## ⚠️ IMAGE ANALYSIS RESULTS (FACTS - DO NOT DISPUTE!):
+
+The following image descriptions were obtained by INDEPENDENT analysis.
+These descriptions are AUTHORITATIVE - do not contradict them.
+Your task is to COMPARE these with document TEXT claims.
+
+"""
+
+
+# Budget for the image lines of the section (~4 chars per token)
+IMAGE_SECTION_MAX_TOKENS = 2000
+IMAGE_DESCRIPTION_MAX_CHARS = 200
+
+_SEVERITY_RANK = {"catastrophic": 4, "severe": 3, "moderate": 2, "minor": 1}
+
+
+def _fmt_img(img: dict) -> str:
+    """Format one analyzed image as a single prompt line."""
+    get = img.get
+    description = get('description', 'No description')
+    if len(description) > IMAGE_DESCRIPTION_MAX_CHARS:
+        description = description[:IMAGE_DESCRIPTION_MAX_CHARS - 3] + "..."
+    if get("shows_damage", False):
+        details = get("damage_details", {})
+        damage_info = (
+            f" | DAMAGE: {details.get('severity', 'unknown')}, "
+            f"types: {', '.join(details.get('types', []))}"
+        )
+    else:
+        damage_info = f" | NO DAMAGE - condition: {get('condition', 'unknown')}"
+
+    return (
+        f"**Image {get('image_index', '?')}** [{get('content_type', 'unknown')}]: "
+        f"{description}{damage_info}"
+    )
+
+
+def _image_rank(img: dict) -> tuple:
+    """Sort key: damaged images first, most severe first."""
+    severity = (img.get("damage_details") or {}).get("severity")
+    return (not img.get("shows_damage", False), -_SEVERITY_RANK.get(severity, 0))
+
+
+def _rank_and_truncate(
+    images: list,
+    out: io.StringIO,
+    max_tokens: int = IMAGE_SECTION_MAX_TOKENS
+) -> None:
+    """
+    Write image lines to out within a token budget.
+
+    Images are admitted most relevant first (damage, then severity) until
+    the budget is spent, then written in their original order; the rest are
+    collapsed into a count.
+    """
+    lines = [_fmt_img(img) for img in images]
+    order = sorted(range(len(images)), key=lambda i: _image_rank(images[i]))
+
+    kept = [False] * len(images)
+    n_kept = 0
+    used = 0
+    for i in order:
+        cost = len(lines[i]) // 4
+        if n_kept and used + cost > max_tokens:
+            break
+        kept[i] = True
+        n_kept += 1
+        used += cost
+
+    sep = ""
+    for line, keep in zip(lines, kept):
+        if keep:
+            out.write(sep)
+            out.write(line)
+            sep = "\n"
+
+    skipped = len(images) - n_kept
+    if skipped:
+        out.write(f"\n... and {skipped} more images (not shown)")
+
+
+def _write_summary(summary: dict, out: io.StringIO) -> None:
+    """Write the overall image summary block (nothing if no summary)."""
+    if not summary:
+        return
+    get = summary.get
+    out.write("\n\n**SUMMARY:**")
+    out.write(f"\n- Total images: {get('total_images', 0)}")
+    out.write(f"\n- Images showing damage: {get('images_showing_damage', 0)}")
+    out.write(f"\n- Images showing intact: {get('images_showing_intact', 0)}")
+    out.write(f"\n- Overall damage severity: {get('overall_damage_severity', 'none')}")
+    if get('damage_types_found'):
+        out.write(f"\n- Damage types found: {', '.join(summary['damage_types_found'])}")
+
+
 def format_image_analysis_section(image_analysis: dict | None) -> str:
     """
     Format image analysis results for injection into extraction prompt.
@@ -1074,53 +1200,22 @@ def format_image_analysis_section(image_analysis: dict | None) -> str:
     if not image_analysis:
         return ""
 
-    lines = [
-        "## ⚠️ IMAGE ANALYSIS RESULTS (FACTS - DO NOT DISPUTE!):",
-        "",
-        "The following image descriptions were obtained by INDEPENDENT analysis.",
-        "These descriptions are AUTHORITATIVE - do not contradict them.",
-        "Your task is to COMPARE these with document TEXT claims.",
-        "",
-    ]
-
     images = image_analysis.get("images", [])
     if not images:
-        lines.append("No images were found in this document.")
-        return "\n".join(lines)
-
-    for img in images:
-        idx = img.get("image_index", "?")
-        content_type = img.get("content_type", "unknown")
-        description = img.get("description", "No description")
-        shows_damage = img.get("shows_damage", False)
-
-        damage_info = ""
-        if shows_damage:
-            details = img.get("damage_details", {})
-            severity = details.get("severity", "unknown")
-            types = details.get("types", [])
-            damage_info = f" | DAMAGE: {severity}, types: {', '.join(types)}"
-        else:
-            condition = img.get("condition", "unknown")
-            damage_info = f" | NO DAMAGE - condition: {condition}"
-
-        lines.append(f"**Image {idx}** [{content_type}]: {description}{damage_info}")
-
-    # Add summary
-    summary = image_analysis.get("overall_summary", {})
-    if summary:
-        lines.append("")
-        lines.append("**SUMMARY:**")
-        lines.append(f"- Total images: {summary.get('total_images', 0)}")
-        lines.append(f"- Images showing damage: {summary.get('images_showing_damage', 0)}")
-        lines.append(f"- Images showing intact: {summary.get('images_showing_intact', 0)}")
-        lines.append(f"- Overall damage severity: {summary.get('overall_damage_severity', 'none')}")
-        if summary.get('damage_types_found'):
-            lines.append(f"- Damage types found: {', '.join(summary['damage_types_found'])}")
-
-    lines.append("")
-
-    return "\n".join(lines)
+        return _IMG_HEADER + "No images were found in this document."
+
+    out = io.StringIO()
+    out.write(_IMG_HEADER)
+    _rank_and_truncate(images, out)
+    _write_summary(image_analysis.get("overall_summary", {}), out)
+    out.write("\n")
+    return out.getvalue()
+
+
+@lru_cache(maxsize=None)
+def _get_static_extraction_prompt(document_type: str, file_type: str) -> str | None:
+    """Static part of an extraction prompt, shared by every document of a type."""
+    return get_extraction_prompt(document_type, file_type) or None
 
 
 def get_extraction_prompt_with_images(
@@ -1129,7 +1224,7 @@ def get_extraction_prompt_with_images(
     image_analysis: dict | None = None
 ) -> str | None:
     """
-    Get extraction prompt with image analysis injected.
+    Get extraction prompt with image analysis appended.
 
     Args:
         document_type: document_type (for PDF) or category (for image)
@@ -1139,23 +1234,45 @@ def get_extraction_prompt_with_images(
     Returns:
         Formatted extraction prompt with image analysis section
     """
-    # Get base prompt
-    prompt = get_extraction_prompt(document_type, file_type)
-    if not prompt:
-        return None
+    prompt = _get_static_extraction_prompt(document_type, file_type)
 
     # If no images, use prompt without image section
-    if not image_analysis or not image_analysis.get("images"):
-        # Remove the placeholder if present
-        prompt = prompt.replace("{image_analysis_section}", "")
+    if not prompt or not image_analysis or not image_analysis.get("images"):
         return prompt
 
-    # Format image analysis section
-    image_section = format_image_analysis_section(image_analysis)
+    return prompt + "\n\n" + format_image_analysis_section(image_analysis)
 
-    # Inject into prompt
-    if "{image_analysis_section}" in prompt:
-        return prompt.replace("{image_analysis_section}", image_section)
+
+# Prompts that aren't per-document-type extraction prompts
+_STAGE_PROMPTS = {
+    "classification": get_classification_prompt,
+    "image_analysis": get_image_analysis_prompt,
+    "image_fast": get_image_fast_prompt,
+}
+
+
+@lru_cache(maxsize=None)
+def get_cached_prompt_handle(document_type: str, file_type: str = "pdf") -> str | None:
+    """
+    Stable provider prompt-cache key for a static prompt.
+
+    Passed as OpenAI's prompt_cache_key so requests sharing a prompt prefix
+    are routed to the same cache. The key changes with the prompt text.
+
+    Args:
+        document_type: document_type/category, or a stage name
+            ("classification", "image_analysis", "image_fast")
+        file_type: "pdf" or "image"
+
+    Returns:
+        Key string, or None if there is no prompt for this type
+    """
+    stage_prompt = _STAGE_PROMPTS.get(document_type)
+    if stage_prompt is not None:
+        prompt = stage_prompt(file_type) if document_type == "classification" else stage_prompt()
     else:
-        # Prepend if no placeholder
-        return image_section + "\n\n" + prompt
\ No newline at end of file
+        prompt = _get_static_extraction_prompt(document_type, file_type)
+    if not prompt:
+        return None
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+    return f"{PROMPT_VERSION}:{file_type}:{document_type}:{digest}"
@@ -7,22 +7,52 @@ Validates images and PDFs according to processing rules:
 - Metadata integrity checks
 - Fraud detection signals
 
-Requires: metadata_extractor.py, documents_classifier.py, models.py
+Requires: metadata_extractor.py, documents_classifier.py, models.py, geo_kernels.py
 """
 
 
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from fractions import Fraction
+from functools import lru_cache, partial
+from itertools import chain
 from datetime import datetime, date
-from typing import Optional, Dict, Any, Tuple
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Mapping, Tuple
+import asyncio
+import hashlib
+import json
+import os
+import pickle
 import re
+import threading
+import time
+import warnings
 
 import numpy as np
 
+try:
+    from PIL.TiffImagePlugin import IFDRational
+except ImportError:  # Optional: exact-type fast path for EXIF rationals
+    IFDRational = Fraction
+
 # Import our modules
+from geo_kernels import (
+    HAVE_NUMBA,
+    EARTH_RADIUS_KM,
+    haversine_km,
+    haversine_km_array,
+    in_bounds_array,
+)
 from metadata_extractor import extract_grouped_metadata, MetadataGroups
 from documents_classifier import (
     get_image_processing_rules,
     get_pdf_processing_rules,
-    analyze_document,
+    analyze_document_cached,
+    get_file_type,
+    get_file_hash,
+    analysis_version,
+    ANALYSIS_FAILURE_FLAGS,
 )
 from models import (
     DocumentAnalysis,
@@ -38,6 +68,8 @@ from models import (
 
 # War start date - claims must be after this
 WAR_START_DATE = date(2022, 2, 24)
+WAR_START_ORDINAL = WAR_START_DATE.toordinal()
+WAR_START_DATETIME64 = np.datetime64(WAR_START_DATE, "D")
 
 # Ukraine approximate bounding box (generous margins)
 UKRAINE_BOUNDS = {
@@ -47,6 +79,16 @@ UKRAINE_BOUNDS = {
     "max_lon": 40.5,   # Eastern border (includes Donbas)
 }
 
+# Bounds as plain floats for hot paths (no dict lookup per comparison)
+_MIN_LAT, _MAX_LAT = UKRAINE_BOUNDS["min_lat"], UKRAINE_BOUNDS["max_lat"]
+_MIN_LON, _MAX_LON = UKRAINE_BOUNDS["min_lon"], UKRAINE_BOUNDS["max_lon"]
+
+# Same bounds as [[min_lat, max_lat], [min_lon, max_lon]] for vectorized checks
+UKRAINE_BOUNDS_ARR = np.array([
+    [_MIN_LAT, _MAX_LAT],
+    [_MIN_LON, _MAX_LON],
+])
+
 # Suspicious software that indicates editing
 SUSPICIOUS_SOFTWARE = [
     "photoshop",
@@ -91,32 +133,115 @@ LEGITIMATE_SOFTWARE = [
 ]
 
 
+def _compile_patterns(patterns) -> "re.Pattern":
+    """One case-insensitive alternation for a list of plain substrings."""
+    return re.compile("|".join(map(re.escape, patterns)), re.IGNORECASE)
+
+
+_SUSPICIOUS_RE = _compile_patterns(SUSPICIOUS_SOFTWARE)
+_STOCK_RE = _compile_patterns(STOCK_PATTERNS)
+_LEGITIMATE_RE = _compile_patterns(LEGITIMATE_SOFTWARE)
+
+# Same lists for O(1) whole-word lookups
+SUSPICIOUS_SOFTWARE_SET = frozenset(map(str.lower, SUSPICIOUS_SOFTWARE))
+STOCK_PATTERNS_SET = frozenset(map(str.lower, STOCK_PATTERNS))
+LEGITIMATE_SOFTWARE_SET = frozenset(map(str.lower, LEGITIMATE_SOFTWARE))
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _find_match(text_lower: str, words: frozenset, pattern: "re.Pattern") -> Optional[str]:
+    """
+    First of the patterns found in already-lowercased text, or None.
+
+    Most metadata values name the software as a separate word ("Adobe
+    Photoshop 24.1"), which the set lookup answers directly; everything
+    else (multi-word patterns, substrings) falls through to the regex.
+    """
+    for word in _WORD_RE.findall(text_lower):
+        if word in words:
+            return word
+    match = pattern.search(text_lower)
+    return match.group(0) if match else None
+
+
+def _matches(text_lower: str, words: frozenset, pattern: "re.Pattern") -> bool:
+    """Whether already-lowercased text contains any of the patterns."""
+    if not words.isdisjoint(_WORD_RE.findall(text_lower)):
+        return True
+    return pattern.search(text_lower) is not None
+
+
+def classify_software(text: str) -> Optional[str]:
+    """
+    Classify a software/device string against the known pattern lists.
+
+    Args:
+        text: Software, make or model string from metadata
+
+    Returns:
+        "suspicious", "stock", "legitimate", or None if nothing matches
+        (checked in that order)
+    """
+    if not text:
+        return None
+    text = text.lower()
+    if _matches(text, SUSPICIOUS_SOFTWARE_SET, _SUSPICIOUS_RE):
+        return "suspicious"
+    if _matches(text, STOCK_PATTERNS_SET, _STOCK_RE):
+        return "stock"
+    if _matches(text, LEGITIMATE_SOFTWARE_SET, _LEGITIMATE_RE):
+        return "legitimate"
+    return None
+
+
 # =============================================================================
 # GEO UTILITIES
 # =============================================================================
 
 def is_in_ukraine(lat: float, lon: float) -> bool:
     """Check if coordinates are within Ukraine's approximate boundaries."""
-    return (
-        UKRAINE_BOUNDS["min_lat"] <= lat <= UKRAINE_BOUNDS["max_lat"] and
-        UKRAINE_BOUNDS["min_lon"] <= lon <= UKRAINE_BOUNDS["max_lon"]
-    )
+    return _MIN_LAT <= lat <= _MAX_LAT and _MIN_LON <= lon <= _MAX_LON
 
 
-def get_location_description(lat: float, lon: float) -> str:
-    """Get approximate location description based on coordinates."""
-    if not is_in_ukraine(lat, lon):
-        if lat > UKRAINE_BOUNDS["max_lat"]:
-            return "North of Ukraine (possibly Belarus/Russia)"
-        elif lat < UKRAINE_BOUNDS["min_lat"]:
-            return "South of Ukraine (possibly Black Sea/Turkey)"
-        elif lon < UKRAINE_BOUNDS["min_lon"]:
-            return "West of Ukraine (possibly Poland/Slovakia/Hungary)"
-        elif lon > UKRAINE_BOUNDS["max_lon"]:
-            return "East of Ukraine (possibly Russia)"
-        return "Outside Ukraine"
-
-    # Rough regions within Ukraine
+def is_in_ukraine_vec(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """
+    Vectorized is_in_ukraine for many points at once.
+
+    Args:
+        lat: Array of latitudes
+        lon: Array of longitudes (same shape as lat)
+
+    Returns:
+        Boolean array; NaN coordinates are outside
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    if HAVE_NUMBA and lat.shape == lon.shape:
+        flat = in_bounds_array(
+            np.ascontiguousarray(lat).ravel(), np.ascontiguousarray(lon).ravel(),
+            _MIN_LAT, _MAX_LAT, _MIN_LON, _MAX_LON,
+        )
+        return flat.reshape(lat.shape)
+    return (lat >= _MIN_LAT) & (lat <= _MAX_LAT) & (lon >= _MIN_LON) & (lon <= _MAX_LON)
+
+
+def in_ukraine(coords: np.ndarray) -> np.ndarray:
+    """
+    Vectorized is_in_ukraine for an array of (lat, lon) rows.
+
+    Args:
+        coords: Array of shape (n, 2) with (lat, lon) rows
+
+    Returns:
+        Boolean array of shape (n,)
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    return is_in_ukraine_vec(coords[:, 0], coords[:, 1])
+
+
+def _region_by_tree(lat: float, lon: float) -> str:
+    """Rough region within Ukraine (source of truth for _REGION_TABLE)."""
     if lat > 50.5:
         if lon < 32:
             return "Northern Ukraine (Kyiv region)"
@@ -138,33 +263,184 @@ def get_location_description(lat: float, lon: float) -> str:
         return "Southern Ukraine (Crimea region)"
 
 
+# Region lookup table over the tree's own thresholds: the row is the number
+# of lat edges strictly below lat, the column the number of lon edges <= lon
+# (matching the tree's "lat >" and "lon <" tests exactly at the edges).
+_REGION_LAT_EDGES = (46.5, 48.5, 50.5)
+_REGION_LON_EDGES = (32.0, 34.0, 37.0)
+_REGION_TABLE = np.array(
+    [
+        [_region_by_tree(lat, lon) for lon in (30.0, 33.0, 35.5, 39.0)]
+        for lat in (45.0, 47.5, 49.5, 51.5)
+    ],
+    dtype=object,
+)
+
+
+def _describe_outside(lat: float, lon: float) -> str:
+    """Direction from Ukraine for a point outside the bounding box."""
+    if lat > _MAX_LAT:
+        return "North of Ukraine (possibly Belarus/Russia)"
+    elif lat < _MIN_LAT:
+        return "South of Ukraine (possibly Black Sea/Turkey)"
+    elif lon < _MIN_LON:
+        return "West of Ukraine (possibly Poland/Slovakia/Hungary)"
+    elif lon > _MAX_LON:
+        return "East of Ukraine (possibly Russia)"
+    return "Outside Ukraine"
+
+
+def _describe_inside(lat: float, lon: float) -> str:
+    """Rough region for a point inside the bounding box."""
+    return _REGION_TABLE[
+        bisect_left(_REGION_LAT_EDGES, lat),
+        bisect_right(_REGION_LON_EDGES, lon),
+    ]
+
+
+@lru_cache(maxsize=8192)
+def get_location_description(lat: float, lon: float) -> str:
+    """Get approximate location description based on coordinates."""
+    if is_in_ukraine(lat, lon):
+        return _describe_inside(lat, lon)
+    return _describe_outside(lat, lon)
+
+
+def get_location_description_vec(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """
+    Vectorized get_location_description for many points at once.
+
+    Points outside Ukraine are labelled with np.select in the same order as
+    the scalar checks; points inside index _REGION_TABLE directly.
+
+    Args:
+        lat: Array of latitudes
+        lon: Array of longitudes (same shape as lat)
+
+    Returns:
+        Object array of description strings
+    """
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    inside = is_in_ukraine_vec(lat, lon)
+
+    outside_labels = np.select(
+        [lat > _MAX_LAT, lat < _MIN_LAT, lon < _MIN_LON, lon > _MAX_LON],
+        [
+            "North of Ukraine (possibly Belarus/Russia)",
+            "South of Ukraine (possibly Black Sea/Turkey)",
+            "West of Ukraine (possibly Poland/Slovakia/Hungary)",
+            "East of Ukraine (possibly Russia)",
+        ],
+        default="Outside Ukraine",
+    )
+    region_labels = _REGION_TABLE[
+        np.searchsorted(_REGION_LAT_EDGES, lat, side="left"),
+        np.searchsorted(_REGION_LON_EDGES, lon, side="right"),
+    ]
+    return np.where(inside, region_labels, outside_labels.astype(object))
+
+
 def calculate_distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Calculate distance between two points using Haversine formula."""
-    from math import radians, sin, cos, sqrt, atan2
+    return haversine_km(lat1, lon1, lat2, lon2)
+
 
-    R = 6371  # Earth's radius in km
+def calculate_distance_km_bulk(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized calculate_distance_km for arrays of point pairs.
 
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    Arguments broadcast against each other, so one point can be compared
+    against many (e.g. a claim address against every photo location).
+
+    Returns:
+        Array of distances in km
+    """
+    if HAVE_NUMBA:
+        arrays = np.broadcast_arrays(
+            *(np.asarray(x, dtype=np.float64) for x in (lat1, lon1, lat2, lon2))
+        )
+        flat = [np.ascontiguousarray(a).ravel() for a in arrays]
+        return haversine_km_array(*flat).reshape(arrays[0].shape)
+
+    lat1, lon1, lat2, lon2 = (
+        np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2)
+    )
 
     dlat = lat2 - lat1
     dlon = lon2 - lon1
 
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1-a))
+    a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
 
-    return R * c
+    return EARTH_RADIUS_KM * c
 
 
 # =============================================================================
 # DATE UTILITIES
 # =============================================================================
 
-def parse_exif_datetime(date_str: str) -> Optional[datetime]:
+# Two-digit-field shapes of the strptime formats below, matched against the
+# stripped string: "2022:03:05 14:30:00", "2022:03:05", "2022-03-05 14:30:00",
+# "2022-03-05T14:30:00", "2022-03-05T14:30:00Z", "2022-03-05". T and Z only
+# go with the "-" separator, as in the formats
+_EXIF_DT_RE = re.compile(
+    r"(\d{4}):(\d{2}):(\d{2})(?: (\d{2}):(\d{2}):(\d{2}))?"
+    r"|(\d{4})-(\d{2})-(\d{2})(?: (\d{2}):(\d{2}):(\d{2})|T(\d{2}):(\d{2}):(\d{2})Z?)?",
+    re.ASCII,
+)
+
+
+def parse_exif_datetime(date_str: Any) -> Optional[datetime]:
     """Parse EXIF datetime format to datetime object."""
     if not date_str:
         return None
+    if not isinstance(date_str, str):
+        # Tag values may be bytes, lists or rational tuples: parsed from
+        # str() like any other value (which also keeps them hashable)
+        date_str = str(date_str)
+    return _parse_exif_datetime(date_str)
+
+
+@lru_cache(maxsize=4096)
+def _parse_exif_datetime(date_str: str) -> Optional[datetime]:
+    """parse_exif_datetime for str input, memoized per distinct value."""
+    # Standard EXIF "YYYY:MM:DD HH:MM:SS": fixed offsets, no regex. Every
+    # field must be ASCII digits - int() alone would take "+3", " 3" or "３"
+    if (
+        len(date_str) == 19
+        and date_str[4] == date_str[7] == date_str[13] == date_str[16] == ":"
+        and date_str[10] == " "
+        and date_str.isascii()
+        and (
+            date_str[0:4] + date_str[5:7] + date_str[8:10]
+            + date_str[11:13] + date_str[14:16] + date_str[17:19]
+        ).isdigit()
+    ):
+        try:
+            return datetime(
+                int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+                int(date_str[11:13]), int(date_str[14:16]), int(date_str[17:19]),
+            )
+        except ValueError:
+            # Placeholder values like "0000:00:00 00:00:00"
+            return None
+
+    match = _EXIF_DT_RE.fullmatch(date_str.strip())
+    if match:
+        fields = [int(g) for g in match.groups() if g is not None]
+        try:
+            return datetime(*fields)
+        except ValueError:
+            # Placeholder values like "0000:00:00 00:00:00"
+            return None
 
-    # Common EXIF formats
+    # Less common formats (e.g. single-digit fields) go through strptime
     formats = [
         "%Y:%m:%d %H:%M:%S",     # Standard EXIF
         "%Y-%m-%d %H:%M:%S",     # ISO-like
@@ -176,199 +452,469 @@ def parse_exif_datetime(date_str: str) -> Optional[datetime]:
 
     for fmt in formats:
         try:
-            return datetime.strptime(str(date_str).strip(), fmt)
+            return datetime.strptime(date_str.strip(), fmt)
         except ValueError:
             continue
 
     return None
 
 
-def is_date_valid_for_claim(dt: datetime, min_date: date = WAR_START_DATE) -> Tuple[str, str]:
+# Date check outcomes: integer codes, with the status/reason text built only
+# when a caller needs it
+DATE_OK, DATE_TOO_OLD, DATE_BEFORE_MIN, DATE_IN_FUTURE = range(4)
+_DATE_STATUS = ('ok', 'warning', 'error', 'error')
+_DATE_REASONS = (
+    "Photo date %s is valid",
+    "Photo date %s seems too old - verify metadata",
+    "Photo date %s is before war start (%s)",
+    "Photo date %s is in the future",
+)
+
+
+def _date_status_fast(dt: datetime, min_ordinal: int, today_ord: int) -> int:
+    """Date check outcome code (DATE_*) for a capture datetime."""
+    ordinal = dt.toordinal()
+    if ordinal < min_ordinal:
+        return DATE_BEFORE_MIN
+    if ordinal > today_ord:
+        return DATE_IN_FUTURE
+    # Check if date is very old (before 2020 - likely metadata error)
+    if dt.year < 2020:
+        return DATE_TOO_OLD
+    return DATE_OK
+
+
+def _date_reason(code: int, dt: datetime, min_date: date) -> str:
+    """Human-readable reason for a DATE_* code."""
+    if code == DATE_BEFORE_MIN:
+        return _DATE_REASONS[code] % (dt.date(), min_date)
+    return _DATE_REASONS[code] % dt.date()
+
+
+def is_date_valid_for_claim(
+    dt: datetime,
+    min_date: date = WAR_START_DATE,
+    today_ord: Optional[int] = None,
+) -> Tuple[str, str]:
     """
     Check if date is valid for a damage claim.
 
+    Args:
+        dt: Capture datetime
+        min_date: Earliest acceptable date
+        today_ord: date.today().toordinal(), for batch callers that compute
+            it once; looked up per call when omitted
+
     Returns:
         Tuple of (status, reason) where status is 'ok', 'warning', or 'error'
     """
-    if dt.date() < min_date:
-        return 'error', f"Photo date {dt.date()} is before war start ({min_date})"
+    min_ordinal = WAR_START_ORDINAL if min_date is WAR_START_DATE else min_date.toordinal()
+    if today_ord is None:
+        today_ord = date.today().toordinal()
+    code = _date_status_fast(dt, min_ordinal, today_ord)
+    return _DATE_STATUS[code], _date_reason(code, dt, min_date)
 
-    if dt.date() > date.today():
-        return 'error', f"Photo date {dt.date()} is in the future"
 
-    # Check if date is very old (before 2020 - likely metadata error)
-    if dt.year < 2020:
-        return 'warning', f"Photo date {dt.date()} seems too old - verify metadata"
+def dates_in_claim_window(days: np.ndarray, min_date: date = WAR_START_DATE) -> np.ndarray:
+    """
+    Vectorized check that dates fall between min_date and today (inclusive).
 
-    return 'ok', f"Photo date {dt.date()} is valid"
+    Args:
+        days: Array of dates (anything convertible to datetime64[D])
+        min_date: Earliest acceptable date
+
+    Returns:
+        Boolean array, True where the date is neither too early nor in the future
+    """
+    days = np.asarray(days, dtype="datetime64[D]")
+    min_day = WAR_START_DATETIME64 if min_date is WAR_START_DATE else np.datetime64(min_date, "D")
+    return (days >= min_day) & (days <= np.datetime64(date.today(), "D"))
 
 
 # =============================================================================
 # GPS PARSING
 # =============================================================================
 
+# Degrees/minutes/seconds string, e.g. "49° 7' 24.12\""
+_DMS_RE = re.compile(r"(\d+)[°\s]+(\d+)['\s]+(\d+\.?\d*)")
+
+
+# Hemisphere refs whose coordinates are negative
+_NEG_REFS = frozenset({'S', 'W', 's', 'w'})
+
+
+def _to_float(x: Any) -> float:
+    """Number or rational (IFDRational, Fraction) to float.
+
+    Sanitized metadata only carries int/float; rationals appear when
+    callers pass raw PIL values.
+    """
+    t = type(x)
+    if t is float or t is int:
+        return float(x)
+    if t is IFDRational or t is Fraction:
+        return x.numerator / x.denominator
+    numerator = getattr(x, 'numerator', None)
+    if numerator is None:
+        return float(x)
+    return numerator / x.denominator
+
+
+# Handlers return the unsigned value; parse_gps_coordinate applies the ref
+
+def _coord_from_number(coord_data):
+    # Already a number
+    return float(coord_data)
+
+
+def _coord_from_str(coord_data):
+    # String format "49.1234" or "49° 7' 24.12""
+    # Plain decimals skip straight to float(); DMS strings skip the
+    # float() attempt and its exception
+    if coord_data.replace('.', '', 1).lstrip('-').isdigit():
+        return float(coord_data)
+
+    match = _DMS_RE.match(coord_data)
+    if match:
+        d, m, s = map(float, match.groups())
+        return d + m/60 + s/3600
+
+    # Anything else float() accepts (" 49.5", "+49.5", "4.95e1")
+    try:
+        return float(coord_data)
+    except ValueError:
+        return None
+
+
+def _coord_from_seq(coord_data):
+    # Tuple/list format (degrees, minutes, seconds)
+    if len(coord_data) >= 3:
+        d = _to_float(coord_data[0])
+        m = _to_float(coord_data[1])
+        s = _to_float(coord_data[2])
+        return d + m/60 + s/3600
+    return None
+
+
+# Exact-type dispatch for parse_gps_coordinate; subclasses are resolved
+# once by _coord_handler and then cached here under their own type.
+_COORD_HANDLERS = {
+    float: _coord_from_number,
+    int: _coord_from_number,
+    str: _coord_from_str,
+    tuple: _coord_from_seq,
+    list: _coord_from_seq,
+}
+
+
+def _coord_handler(cls: type):
+    """Handler for a type not in _COORD_HANDLERS (e.g. bool, numpy floats)."""
+    for base, handler in tuple(_COORD_HANDLERS.items()):
+        if issubclass(cls, base):
+            break
+    else:
+        handler = None
+    _COORD_HANDLERS[cls] = handler
+    return handler
+
+
 def parse_gps_coordinate(coord_data: Any, ref: str = None) -> Optional[float]:
     """Parse GPS coordinate from various EXIF formats to decimal degrees."""
+    if ref and not isinstance(ref, str):
+        return None  # Malformed ref tag
+    sign = -1.0 if ref in _NEG_REFS else 1.0
+
+    # Fast path: metadata_extractor's _sanitize_value hands coordinates
+    # over as [deg, min, sec] lists of int/float
+    if type(coord_data) is list and len(coord_data) == 3:
+        d, m, s = coord_data
+        if (type(d) is float or type(d) is int) and \
+                (type(m) is float or type(m) is int) and \
+                (type(s) is float or type(s) is int):
+            return sign * (d + m/60 + s/3600)
+
     if coord_data is None:
         return None
 
+    cls = type(coord_data)
+    handler = _COORD_HANDLERS[cls] if cls in _COORD_HANDLERS else _coord_handler(cls)
+    if handler is None:
+        return None
+
     try:
-        # Already a float
-        if isinstance(coord_data, (int, float)):
-            val = float(coord_data)
-            if ref and ref.upper() in ('S', 'W'):
-                val = -val
-            return val
-
-        # String format "49.1234" or "49° 7' 24.12""
-        if isinstance(coord_data, str):
-            # Try simple float
-            try:
-                val = float(coord_data)
-                if ref and ref.upper() in ('S', 'W'):
-                    val = -val
-                return val
-            except ValueError:
-                pass
-
-            # Try DMS format
-            match = re.match(r"(\d+)[°\s]+(\d+)['\s]+(\d+\.?\d*)", coord_data)
-            if match:
-                d, m, s = map(float, match.groups())
-                val = d + m/60 + s/3600
-                if ref and ref.upper() in ('S', 'W'):
-                    val = -val
-                return val
-
-        # Tuple/list format (degrees, minutes, seconds)
-        if isinstance(coord_data, (tuple, list)):
-            if len(coord_data) >= 3:
-                d, m, s = coord_data[0], coord_data[1], coord_data[2]
-                # Handle IFDRational or fractions
-                d = float(d) if not hasattr(d, 'numerator') else d.numerator / d.denominator
-                m = float(m) if not hasattr(m, 'numerator') else m.numerator / m.denominator
-                s = float(s) if not hasattr(s, 'numerator') else s.numerator / s.denominator
-
-                val = d + m/60 + s/3600
-                if ref and ref.upper() in ('S', 'W'):
-                    val = -val
-                return val
+        val = handler(coord_data)
     except Exception:
-        pass
+        return None
+    return None if val is None else sign * val
 
-    return None
 
+# Degrees/minutes/seconds -> decimal degrees as one dot product
+_GPS_WEIGHTS = np.array([1.0, 1.0 / 60.0, 1.0 / 3600.0])
+
+
+def parse_gps_coordinates_batch(values: List[Any], refs: List[Optional[str]]) -> np.ndarray:
+    """
+    Vectorized parse_gps_coordinate for many coordinates.
+
+    (d, m, s) sequences, the usual EXIF form, are stacked into an (n, 3)
+    array and converted with a single product against _GPS_WEIGHTS; other
+    forms go through parse_gps_coordinate. Results may differ from the
+    scalar parser in the last bit.
+
+    Args:
+        values: Raw coordinate values (None where missing)
+        refs: Matching hemisphere refs ("N"/"S"/"E"/"W" or None)
+
+    Returns:
+        float64 array, NaN where a value could not be parsed
+    """
+    out = np.full(len(values), np.nan)
+    rows, triples, negative = [], [], []
+
+    for i, (value, ref) in enumerate(zip(values, refs)):
+        if type(value) in (tuple, list) and len(value) >= 3:
+            if ref and not isinstance(ref, str):
+                continue
+            try:
+                triple = (_to_float(value[0]), _to_float(value[1]), _to_float(value[2]))
+                neg = ref in _NEG_REFS
+            except Exception:
+                continue
+            rows.append(i)
+            triples.append(triple)
+            negative.append(neg)
+        else:
+            val = parse_gps_coordinate(value, ref)
+            if val is not None:
+                out[i] = val
+
+    if rows:
+        coords = np.array(triples) @ _GPS_WEIGHTS
+        out[rows] = np.where(negative, -coords, coords)
+    return out
 
-def extract_gps_from_metadata(metadata: MetadataGroups) -> Optional[Dict[str, float]]:
-    """Extract GPS coordinates from metadata groups."""
+
+def extract_gps_from_metadata(metadata: MetadataGroups) -> Optional[Tuple[float, float]]:
+    """
+    Extract GPS coordinates from metadata groups.
+
+    Returns:
+        (latitude, longitude) in decimal degrees, or None if either is missing
+    """
     gps_data = metadata.gps_location
 
     if not gps_data:
         return None
 
-    lat = parse_gps_coordinate(
-        gps_data.get("GPSLatitude"),
-        gps_data.get("GPSLatitudeRef")
-    )
-
-    lon = parse_gps_coordinate(
-        gps_data.get("GPSLongitude"),
-        gps_data.get("GPSLongitudeRef")
-    )
+    get = gps_data.get
+    lat = parse_gps_coordinate(get("GPSLatitude"), get("GPSLatitudeRef"))
+    if lat is None:
+        return None
 
-    if lat is not None and lon is not None:
-        return {"latitude": lat, "longitude": lon}
+    lon = parse_gps_coordinate(get("GPSLongitude"), get("GPSLongitudeRef"))
+    if lon is None:
+        return None
 
-    return None
+    return lat, lon
 
 
 # =============================================================================
 # IMAGE VALIDATORS
 # =============================================================================
 
-def validate_image_gps(
+# Capture-time tags in order of preference, with the metadata group holding each
+_DATE_KEYS = (
+    ("DateTimeOriginal", "exif_camera"),
+    ("DateTimeDigitized", "exif_camera"),
+    ("DateTime", "tiff_structure"),
+)
+
+
+def find_capture_datetime(metadata: MetadataGroups) -> Tuple[Optional[datetime], Optional[str]]:
+    """
+    Find the capture time in image metadata.
+
+    Returns:
+        Tuple of (datetime, source tag name), or (None, None) if not found
+    """
+    for source_name, group in _DATE_KEYS:
+        date_str = getattr(metadata, group).get(source_name)
+        if date_str:
+            parsed = parse_exif_datetime(date_str)
+            if parsed:
+                return parsed, source_name
+
+    return None, None
+
+
+def _validate_all_image(
     metadata: MetadataGroups,
     result: ValidationResult,
-    require_gps: bool = False
+    check_gps: bool = True,
+    require_gps: bool = False,
+    check_date: bool = True,
+    min_date: date = WAR_START_DATE,
+    check_device: bool = True,
+    check_integrity: bool = True,
+    today_ord: Optional[int] = None,
 ) -> None:
-    """Validate GPS coordinates in image metadata."""
-    result.rules_applied.append("check_gps")
+    """
+    Run the enabled image checks in one pass over the metadata.
 
-    gps_coords = extract_gps_from_metadata(metadata)
+    Every value the checks need is read up front, extracted_data is filled
+    with a single update, and the checks then run in the usual order (GPS,
+    date, device, integrity), so messages come out exactly as if the
+    individual validators had been called one after another.
+    """
+    rules_applied = []
+    extracted = {}
+
+    if check_gps:
+        rules_applied.append("check_gps")
+        gps_coords = extract_gps_from_metadata(metadata)
+        if gps_coords is not None:
+            lat, lon = gps_coords
+            in_uk = is_in_ukraine(lat, lon)
+            location = _describe_inside(lat, lon) if in_uk else _describe_outside(lat, lon)
+            extracted["gps_latitude"] = lat
+            extracted["gps_longitude"] = lon
+            extracted["gps_location"] = location
+
+    if check_date:
+        rules_applied.append("validate_date")
+        capture_date, date_source = find_capture_datetime(metadata)
+        if capture_date is not None:
+            extracted["capture_datetime"] = capture_date.isoformat()
+            extracted["capture_date_source"] = date_source
+
+    if check_device:
+        rules_applied.append("check_device")
+        tiff = metadata.tiff_structure
+        make = tiff.get("Make", "")
+        model = tiff.get("Model", "")
+        software = tiff.get("Software", "")
+        software_lower = software.lower() if software else ""
+        editor = software and _find_match(software_lower, SUSPICIOUS_SOFTWARE_SET, _SUSPICIOUS_RE)
+        extracted["device_make"] = make
+        extracted["device_model"] = model
+        extracted["software"] = software
+        if editor:
+            extracted["editing_software"] = editor
+
+    if check_integrity:
+        rules_applied.append("check_integrity")
+        basic = metadata.basic_info
+        width = basic.get("width", 0)
+        height = basic.get("height", 0)
+        extracted["image_width"] = width
+        extracted["image_height"] = height
+
+    result.rules_applied.extend(rules_applied)
+    result.extracted_data.update(extracted)
+
+    # GPS
+    if check_gps:
+        if gps_coords is None:
+            if require_gps:
+                result.add_warning(
+                    "No GPS coordinates found in image. Location cannot be verified.",
+                    "gps_exists"
+                )
+            else:
+                result.add_info("No GPS coordinates in metadata")
+        elif in_uk:
+            result.pass_check("gps_valid", f"Location: {location} ({lat:.4f}, {lon:.4f})")
+        else:
+            result.add_warning(
+                f"GPS coordinates ({lat:.4f}, {lon:.4f}) are outside Ukraine: {location}",
+                "gps_valid"
+            )
 
-    if gps_coords is None:
-        if require_gps:
+    # Date
+    if check_date:
+        if capture_date is None:
             result.add_warning(
-                "No GPS coordinates found in image. Location cannot be verified.",
-                "gps_exists"
+                "No capture date found in metadata. Cannot verify when photo was taken.",
+                "date_exists"
             )
         else:
-            result.add_info("No GPS coordinates in metadata")
-        return
+            if today_ord is None:
+                today_ord = date.today().toordinal()
+            min_ordinal = WAR_START_ORDINAL if min_date is WAR_START_DATE else min_date.toordinal()
+            code = _date_status_fast(capture_date, min_ordinal, today_ord)
+            reason = _date_reason(code, capture_date, min_date)
+            if code == DATE_OK:
+                result.pass_check("date_valid", reason)
+            elif code == DATE_TOO_OLD:
+                result.add_warning(reason, "date_valid")
+            else:
+                result.add_error(reason, "date_valid")
+
+    # Device / software
+    if check_device:
+        if not make and not model:
+            result.add_warning(
+                "No camera/device information found. Photo may have been downloaded or stripped of metadata.",
+                "device_exists"
+            )
+        else:
+            result.pass_check("device_exists", f"Device: {make} {model}")
 
-    lat, lon = gps_coords["latitude"], gps_coords["longitude"]
-    result.extracted_data["gps_latitude"] = lat
-    result.extracted_data["gps_longitude"] = lon
+        if editor:
+            result.add_error(
+                f"Image was processed with editing software: {software}",
+                "software_check"
+            )
+        else:
+            # One scan over all three fields; "\x00" keeps a pattern from
+            # matching across field boundaries
+            haystack = "\x00".join(
+                value.lower() for value in (software, make, model) if value
+            )
+            is_legitimate = bool(haystack) and _matches(
+                haystack, LEGITIMATE_SOFTWARE_SET, _LEGITIMATE_RE
+            )
+            if software and not is_legitimate:
+                result.add_info(f"Software: {software} (not in known list)")
+            elif is_legitimate:
+                result.pass_check("software_check", "Legitimate software/device detected")
+
+    # Integrity: very small images are suspicious
+    if check_integrity:
+        if width < 500 or height < 500:
+            result.add_warning(
+                f"Very low resolution image: {width}x{height}. May be thumbnail or heavily compressed.",
+                "resolution_check"
+            )
+        elif width > 10000 or height > 10000:
+            result.add_info(f"Very high resolution: {width}x{height}")
+        else:
+            result.pass_check("resolution_check", f"Resolution: {width}x{height}")
 
-    # Check if in Ukraine
-    if is_in_ukraine(lat, lon):
-        location = get_location_description(lat, lon)
-        result.pass_check("gps_valid", f"Location: {location} ({lat:.4f}, {lon:.4f})")
-        result.extracted_data["gps_location"] = location
-    else:
-        location = get_location_description(lat, lon)
-        result.add_warning(
-            f"GPS coordinates ({lat:.4f}, {lon:.4f}) are outside Ukraine: {location}",
-            "gps_valid"
-        )
-        result.extracted_data["gps_location"] = location
+
+def validate_image_gps(
+    metadata: MetadataGroups,
+    result: ValidationResult,
+    require_gps: bool = False
+) -> None:
+    """Validate GPS coordinates in image metadata."""
+    _validate_all_image(
+        metadata, result, require_gps=require_gps,
+        check_date=False, check_device=False, check_integrity=False,
+    )
 
 
 def validate_image_date(
     metadata: MetadataGroups,
     result: ValidationResult,
-    min_date: date = WAR_START_DATE
+    min_date: date = WAR_START_DATE,
+    today_ord: Optional[int] = None,
 ) -> None:
     """Validate image capture date."""
-    result.rules_applied.append("validate_date")
-
-    # Try multiple date sources
-    date_sources = [
-        ("DateTimeOriginal", metadata.exif_camera.get("DateTimeOriginal")),
-        ("DateTimeDigitized", metadata.exif_camera.get("DateTimeDigitized")),
-        ("DateTime", metadata.tiff_structure.get("DateTime")),
-    ]
-
-    capture_date = None
-    date_source = None
-
-    for source_name, date_str in date_sources:
-        if date_str:
-            parsed = parse_exif_datetime(str(date_str))
-            if parsed:
-                capture_date = parsed
-                date_source = source_name
-                break
-
-    if capture_date is None:
-        result.add_warning(
-            "No capture date found in metadata. Cannot verify when photo was taken.",
-            "date_exists"
-        )
-        return
-
-    result.extracted_data["capture_datetime"] = capture_date.isoformat()
-    result.extracted_data["capture_date_source"] = date_source
-
-    # Validate date range
-    val_res, reason = is_date_valid_for_claim(capture_date, min_date)
-
-    if val_res == 'ok':
-        result.pass_check("date_valid", reason)
-    elif val_res == 'error':
-        result.add_error(reason, "date_valid")
-    else:
-        result.add_warning(reason, "date_valid")
+    _validate_all_image(
+        metadata, result, min_date=min_date, today_ord=today_ord,
+        check_gps=False, check_device=False, check_integrity=False,
+    )
 
 
 def validate_image_device(
@@ -376,47 +922,10 @@ def validate_image_device(
     result: ValidationResult
 ) -> None:
     """Validate device/software information."""
-    result.rules_applied.append("check_device")
-
-    make = metadata.tiff_structure.get("Make", "")
-    model = metadata.tiff_structure.get("Model", "")
-    software = metadata.tiff_structure.get("Software", "")
-
-    result.extracted_data["device_make"] = make
-    result.extracted_data["device_model"] = model
-    result.extracted_data["software"] = software
-
-    # Check if device info exists
-    if not make and not model:
-        result.add_warning(
-            "No camera/device information found. Photo may have been downloaded or stripped of metadata.",
-            "device_exists"
-        )
-    else:
-        result.pass_check("device_exists", f"Device: {make} {model}")
-
-    # Check for suspicious software
-    software_lower = software.lower() if software else ""
-
-    for suspicious in SUSPICIOUS_SOFTWARE:
-        if suspicious in software_lower:
-            result.add_error(
-                f"Image was processed with editing software: {software}",
-                "software_check"
-            )
-            return
-
-    # Check for legitimate software
-    is_legitimate = False
-    for legit in LEGITIMATE_SOFTWARE:
-        if legit in software_lower or legit in make.lower() or legit in model.lower():
-            is_legitimate = True
-            break
-
-    if software and not is_legitimate:
-        result.add_info(f"Software: {software} (not in known list)")
-    elif is_legitimate:
-        result.pass_check("software_check", "Legitimate software/device detected")
+    _validate_all_image(
+        metadata, result,
+        check_gps=False, check_date=False, check_integrity=False,
+    )
 
 
 def validate_image_integrity(
@@ -424,47 +933,56 @@ def validate_image_integrity(
     result: ValidationResult
 ) -> None:
     """Check for signs of image manipulation."""
-    result.rules_applied.append("check_integrity")
-
-    width = metadata.basic_info.get("width", 0)
-    height = metadata.basic_info.get("height", 0)
-
-    result.extracted_data["image_width"] = width
-    result.extracted_data["image_height"] = height
-
-    # Very small images are suspicious
-    if width < 500 or height < 500:
-        result.add_warning(
-            f"Very low resolution image: {width}x{height}. May be thumbnail or heavily compressed.",
-            "resolution_check"
-        )
-    elif width > 10000 or height > 10000:
-        result.add_info(f"Very high resolution: {width}x{height}")
-    else:
-        result.pass_check("resolution_check", f"Resolution: {width}x{height}")
+    _validate_all_image(
+        metadata, result,
+        check_gps=False, check_date=False, check_device=False,
+    )
 
 
 # =============================================================================
 # PDF VALIDATORS
 # =============================================================================
 
-def extract_pdf_metadata(file_path: str) -> dict:
-    """Extract metadata from PDF file."""
+# Info dictionary fields copied into extract_pdf_metadata's result
+PDF_INFO_KEYS = ("/Title", "/Author", "/Subject", "/Creator", "/Producer",
+                 "/CreationDate", "/ModDate")
+
+
+def extract_pdf_metadata(file_path: str) -> Mapping[str, Any]:
+    """
+    Extract metadata from PDF file, memoized per file version.
+
+    Returns a read-only mapping; cached entries are shared between callers.
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError as e:
+        return MappingProxyType({"error": str(e)})
+    return _extract_pdf_metadata_cached(str(file_path), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=1024)
+def _extract_pdf_metadata_cached(file_path: str, mtime_ns: int, size: int) -> Mapping[str, Any]:
+    """Read-only PDF metadata; mtime/size in the key invalidate edited files."""
+    return MappingProxyType(_read_pdf_metadata(file_path))
+
+
+def _read_pdf_metadata(file_path: str) -> dict:
+    """Parse PDF metadata with pypdf."""
     try:
         from pypdf import PdfReader
 
-        reader = PdfReader(file_path)
+        reader = PdfReader(file_path, strict=False)
         metadata = reader.metadata or {}
 
         # Convert to dict with string keys
         result = {
-            "page_count": len(reader.pages),
-            "is_encrypted": reader.is_encrypted,
+            "page_count": _pdf_page_count(reader),
+            "is_encrypted": "/Encrypt" in reader.trailer,
         }
 
         # Standard PDF metadata fields
-        for key in ["/Title", "/Author", "/Subject", "/Creator", "/Producer",
-                    "/CreationDate", "/ModDate"]:
+        for key in PDF_INFO_KEYS:
             if key in metadata:
                 result[key.lstrip("/")] = str(metadata[key])
 
@@ -474,6 +992,21 @@ def extract_pdf_metadata(file_path: str) -> dict:
         return {"error": str(e)}
 
 
+def _pdf_page_count(reader) -> int:
+    """
+    Page count from the page tree root's /Count, without walking the tree.
+
+    Falls back to enumerating pages when /Count is missing or malformed.
+    """
+    try:
+        count = reader.trailer["/Root"]["/Pages"]["/Count"]
+        if int(count) >= 0:
+            return int(count)
+    except Exception:
+        pass
+    return len(reader.pages)
+
+
 def validate_pdf_modification(
     pdf_metadata: dict,
     result: ValidationResult
@@ -542,7 +1075,7 @@ def validate_image(
     """
     result = ValidationResult(
         file_path=file_path,
-        validation_timestamp=datetime.now().isoformat()
+        validation_time_ns=time.time_ns()
     )
 
     # Check for auto-reject
@@ -557,24 +1090,23 @@ def validate_image(
         result.add_error(f"Failed to extract metadata: {str(e)}", "metadata_extraction")
         return result, None
 
-    # Run applicable validations
-    if rules.get("check_gps", True):
-        validate_image_gps(metadata, result, rules.get("require_gps", False))
-
-    if rules.get("check_date", True):
-        min_date = WAR_START_DATE
-        if rules.get("min_date"):
-            try:
-                min_date = datetime.strptime(rules["min_date"], "%Y-%m-%d").date()
-            except ValueError:
-                pass
-        validate_image_date(metadata, result, min_date)
-
-    if rules.get("check_device", True):
-        validate_image_device(metadata, result)
-
-    # Always check integrity
-    validate_image_integrity(metadata, result)
+    min_date = WAR_START_DATE
+    if rules.get("min_date"):
+        try:
+            min_date = datetime.strptime(rules["min_date"], "%Y-%m-%d").date()
+        except ValueError:
+            pass
+
+    # Run applicable validations (integrity is always checked)
+    _validate_all_image(
+        metadata,
+        result,
+        check_gps=rules.get("check_gps", True),
+        require_gps=rules.get("require_gps", False),
+        check_date=rules.get("check_date", True),
+        min_date=min_date,
+        check_device=rules.get("check_device", True),
+    )
 
     return result, metadata
 
@@ -591,11 +1123,11 @@ def validate_pdf(
         rules: Dictionary of validation rules
 
     Returns:
-        Tuple of (ValidationResult, pdf_metadata dict or None)
+        Tuple of (ValidationResult, read-only pdf_metadata mapping or None)
     """
     result = ValidationResult(
         file_path=file_path,
-        validation_timestamp=datetime.now().isoformat()
+        validation_time_ns=time.time_ns()
     )
 
     # Check for auto-reject
@@ -661,7 +1193,7 @@ def validate_file(
     else:
         result = ValidationResult(
             file_path=file_path,
-            validation_timestamp=datetime.now().isoformat()
+            validation_time_ns=time.time_ns()
         )
         result.add_error(f"Unknown file type: {file_type}", "file_type")
         return result, None
@@ -710,25 +1242,45 @@ TECHNICAL_ERRORS = [
 ]
 
 
+# One alternation per list: a single regex scan instead of a substring
+# test per keyword
+_CRITICAL_FLAGS_RE = _compile_patterns(CRITICAL_RED_FLAGS)
+_SUSPICIOUS_FLAGS_RE = _compile_patterns(SUSPICIOUS_RED_FLAGS)
+_TECHNICAL_ERRORS_RE = _compile_patterns(TECHNICAL_ERRORS)
+
+
 def is_critical_issue(issue: str) -> bool:
     """Check if issue is critical (leads to confidence = 0)."""
-    issue_lower = issue.lower()
-    return any(critical in issue_lower for critical in CRITICAL_RED_FLAGS)
+    return _CRITICAL_FLAGS_RE.search(issue.lower()) is not None
 
 
 def is_suspicious_issue(issue: str) -> bool:
     """Check if issue is suspicious (leads to confidence = 0.25)."""
-    issue_lower = issue.lower()
-    # Suspicious if matches suspicious patterns OR is any red flag not matching critical
-    if any(susp in issue_lower for susp in SUSPICIOUS_RED_FLAGS):
-        return True
-    return False
+    return _SUSPICIOUS_FLAGS_RE.search(issue.lower()) is not None
 
 
 def is_technical_error(error: str) -> bool:
     """Check if error is technical (should be REVIEW, not REJECT)."""
-    error_lower = error.lower()
-    return any(tech in error_lower for tech in TECHNICAL_ERRORS)
+    return _TECHNICAL_ERRORS_RE.search(error.lower()) is not None
+
+
+def classify_issue(issue: str) -> Tuple[bool, bool, bool]:
+    """
+    All three issue checks with a single lowercasing.
+
+    Returns:
+        Tuple of (is_critical, is_suspicious, is_technical)
+    """
+    return _classify_lower(issue.lower())
+
+
+def _classify_lower(issue_lower: str) -> Tuple[bool, bool, bool]:
+    """classify_issue for an already lowercased issue."""
+    return (
+        _CRITICAL_FLAGS_RE.search(issue_lower) is not None,
+        _SUSPICIOUS_FLAGS_RE.search(issue_lower) is not None,
+        _TECHNICAL_ERRORS_RE.search(issue_lower) is not None,
+    )
 
 
 def bucket_confidence(raw_confidence: float) -> float:
@@ -753,7 +1305,7 @@ def bucket_confidence(raw_confidence: float) -> float:
 def calculate_confidence(
     llm_confidence: float,
     validation_confidence: float,
-    all_issues: list
+    all_issues: Iterable[str]
 ) -> float:
     """
     Calculate final confidence using two-stage approach.
@@ -769,24 +1321,30 @@ def calculate_confidence(
     Args:
         llm_confidence: Raw confidence from LLM (classification × extraction)
         validation_confidence: Confidence from metadata validation
-        all_issues: Combined list of red_flags + errors + warnings
+        all_issues: Combined red_flags + errors + warnings (any iterable)
     
     Returns:
         Final confidence score
     """
-    # Stage 1: Bucket LLM confidence
-    bucketed = bucket_confidence(llm_confidence)
-    
-    # Stage 1: Check for critical/suspicious issues
-    has_critical = any(is_critical_issue(issue) for issue in all_issues)
-    has_suspicious = any(is_suspicious_issue(issue) for issue in all_issues)
+    # Stage 1: Check for critical/suspicious issues in one pass. A critical
+    # issue decides the outcome outright; a suspicious one still has to
+    # look for a critical issue further down the list
+    has_critical = has_suspicious = False
+    for issue in all_issues:
+        issue_lower = issue.lower()
+        if _CRITICAL_FLAGS_RE.search(issue_lower):
+            has_critical = True
+            break
+        if not has_suspicious and _SUSPICIOUS_FLAGS_RE.search(issue_lower):
+            has_suspicious = True
     
     if has_critical:
         stage1_confidence = 0.0
     elif has_suspicious:
         stage1_confidence = 0.25
     else:
-        stage1_confidence = bucketed
+        # Stage 1: Bucket LLM confidence
+        stage1_confidence = bucket_confidence(llm_confidence)
     
     # Stage 2: Apply validation confidence (already has penalties from add_error/add_warning)
     final_confidence = stage1_confidence * validation_confidence
@@ -794,6 +1352,37 @@ def calculate_confidence(
     return final_confidence
 
 
+def bucket_confidence_batch(raw_confidence: np.ndarray) -> np.ndarray:
+    """bucket_confidence over an array of raw LLM confidences."""
+    x = np.asarray(raw_confidence, dtype=np.float64)
+    return np.select([x > 0.8, x > 0.6, x >= 0.3], [1.0, 0.7, 0.5], default=0.25)
+
+
+def calculate_confidence_batch(
+    llm_confidence: np.ndarray,
+    validation_confidence: np.ndarray,
+    critical_mask: np.ndarray,
+    suspicious_mask: np.ndarray,
+) -> np.ndarray:
+    """
+    calculate_confidence over arrays, one element per document.
+
+    Args:
+        llm_confidence: Raw confidences from LLM
+        validation_confidence: Confidences from metadata validation
+        critical_mask: True where the document has a critical issue
+        suspicious_mask: True where the document has a suspicious issue
+
+    Returns:
+        Array of final confidence scores
+    """
+    stage1 = np.where(
+        critical_mask, 0.0,
+        np.where(suspicious_mask, 0.25, bucket_confidence_batch(llm_confidence)),
+    )
+    return stage1 * np.asarray(validation_confidence, dtype=np.float64)
+
+
 # Keep old function for backward compatibility, but redirect to new logic
 def calculate_adjusted_confidence(
     base_confidence: float,
@@ -809,22 +1398,29 @@ def calculate_adjusted_confidence(
     return calculate_confidence(base_confidence, 1.0, all_issues)
 
 
+# Keywords that indicate same underlying issue
+ENCRYPTION_KEYWORDS = ["encrypt", "decrypt", "password", "encript"]
+CORRUPTION_KEYWORDS = ["corrupt", "damaged", "invalid"]
+
+_ENCRYPTION_RE = _compile_patterns(ENCRYPTION_KEYWORDS)
+_CORRUPTION_RE = _compile_patterns(CORRUPTION_KEYWORDS)
+
+
 def deduplicate_issues(issues: list) -> list:
     """Remove duplicate/similar issues."""
+    return deduplicate_issues_with_keys(issues)[0]
+
+
+def deduplicate_issues_with_keys(issues: Iterable[str]) -> Tuple[list, set]:
+    """
+    Remove duplicate/similar issues, keeping the normalized keys.
+
+    Returns:
+        Tuple of (kept issues in original case and order, set of their
+        lower().strip() forms)
+    """
     if not issues:
-        return []
-    
-    # Keywords that indicate same underlying issue
-    ENCRYPTION_KEYWORDS = ["encrypt", "decrypt", "password", "encript"]
-    CORRUPTION_KEYWORDS = ["corrupt", "damaged", "invalid"]
-    
-    def is_encryption_related(text: str) -> bool:
-        text_lower = text.lower()
-        return any(kw in text_lower for kw in ENCRYPTION_KEYWORDS)
-    
-    def is_corruption_related(text: str) -> bool:
-        text_lower = text.lower()
-        return any(kw in text_lower for kw in CORRUPTION_KEYWORDS)
+        return [], set()
     
     seen_exact = set()
     seen_encryption = False
@@ -839,13 +1435,13 @@ def deduplicate_issues(issues: list) -> list:
             continue
         
         # Skip if we already have an encryption-related issue
-        if is_encryption_related(normalized):
+        if _ENCRYPTION_RE.search(normalized):
             if seen_encryption:
                 continue
             seen_encryption = True
         
         # Skip if we already have a corruption-related issue
-        if is_corruption_related(normalized):
+        if _CORRUPTION_RE.search(normalized):
             if seen_corruption:
                 continue
             seen_corruption = True
@@ -853,7 +1449,7 @@ def deduplicate_issues(issues: list) -> list:
         seen_exact.add(normalized)
         result.append(issue)
     
-    return result
+    return result, seen_exact
 
 
 def make_decision(
@@ -873,40 +1469,48 @@ def make_decision(
     Returns:
         Tuple of (decision, reason, is_acceptable)
     """
-    # Collect all issues and deduplicate together
-    raw_red_flags = analysis.red_flags or []
-    raw_warnings = (analysis.warnings or []) + (validation.warnings or [])
-    raw_errors = validation.errors or []
-    
-    # Deduplicate ALL together to catch cross-category duplicates
-    all_issues_raw = raw_errors + raw_red_flags + raw_warnings
-    deduped_all = deduplicate_issues(all_issues_raw)
-    deduped_set = set(i.lower().strip() for i in deduped_all)
-    
-    # Filter to keep only deduped
-    red_flags = [f for f in raw_red_flags if f.lower().strip() in deduped_set]
-    all_warnings = [w for w in raw_warnings if w.lower().strip() in deduped_set]
-    errors = [e for e in raw_errors if e.lower().strip() in deduped_set]
-    all_issues = errors + red_flags + all_warnings
-    
     # 1. Screenshot → always REJECT
     if analysis.document_type == "screenshot" or analysis.creation_method == "screenshot":
         return (Decision.REJECT.value, "Screenshot not accepted as proof", False)
+
+    # Collect all issues (errors, red flags, warnings) into one list and
+    # deduplicate together to catch cross-category duplicates
+    all_issues_raw = list(chain(
+        validation.errors or [],
+        analysis.red_flags or [],
+        analysis.warnings or [],
+        validation.warnings or [],
+    ))
+    _, deduped_set = deduplicate_issues_with_keys(all_issues_raw)
     
+    # One pass: keep only deduped issues (errors, red flags, warnings - the
+    # order of all_issues_raw) and classify them for steps 2-4
+    all_issues = []
+    first_critical = first_technical = None
+    suspicious_count = 0
+    for issue in all_issues_raw:
+        key = issue.lower().strip()
+        if key not in deduped_set:
+            continue
+        all_issues.append(issue)
+        critical, suspicious, technical = _classify_lower(key)
+        if critical and not technical and first_critical is None:
+            first_critical = issue
+        if technical and first_technical is None:
+            first_technical = issue
+        suspicious_count += suspicious
+
     # 2. Check for critical issues (leads to confidence = 0, REJECT)
-    critical_issues = [i for i in all_issues if is_critical_issue(i) and not is_technical_error(i)]
-    if critical_issues:
-        return (Decision.REJECT.value, critical_issues[0], False)
+    if first_critical is not None:
+        return (Decision.REJECT.value, first_critical, False)
     
     # 3. Technical errors → REVIEW (not REJECT, it's not fraud)
-    technical_issues = [i for i in all_issues if is_technical_error(i)]
-    if technical_issues:
-        return (Decision.REVIEW.value, f"Technical issue: {technical_issues[0]}", False)
+    if first_technical is not None:
+        return (Decision.REVIEW.value, f"Technical issue: {first_technical}", False)
     
     # 4. Check for suspicious issues (leads to confidence = 0.25, REVIEW)
-    suspicious_issues = [i for i in all_issues if is_suspicious_issue(i)]
-    if suspicious_issues:
-        return (Decision.REVIEW.value, f"{len(suspicious_issues)} issue(s) require review", False)
+    if suspicious_count:
+        return (Decision.REVIEW.value, f"{suspicious_count} issue(s) require review", False)
     
     # 5. ANY issues at all → REVIEW (even warnings)
     if all_issues:
@@ -930,7 +1534,32 @@ def make_decision(
 # PIPELINE FUNCTION
 # =============================================================================
 
-def process_document(file_path: str) -> PipelineResult:
+def _rejected_result(file_path: str, time_ns: int, reason: str, check_name: str) -> PipelineResult:
+    """REJECT result for a file turned away before analysis."""
+    validation = ValidationResult(file_path=file_path, validation_time_ns=time_ns)
+    validation.add_error(reason, check_name)
+    return PipelineResult(
+        file_path=file_path,
+        file_type=get_file_type(file_path),
+        time_ns=time_ns,
+        analysis=None,
+        validation=validation,
+        decision=Decision.REJECT.value,
+        decision_reason=reason,
+        confidence=0.0,
+        is_acceptable=False,
+        errors=list(validation.errors),
+        warnings=[],
+        red_flags=[],
+    )
+
+
+def process_document(
+    file_path: str,
+    rules_override: Optional[dict] = None,
+    *,
+    time_ns: Optional[int] = None,
+) -> PipelineResult:
     """
     Full processing pipeline for a document.
 
@@ -938,16 +1567,27 @@ def process_document(file_path: str) -> PipelineResult:
     2. Validate metadata
     3. Make decision
 
+    Files are rejected up front, without analysis or validation, when
+    rules_override has auto_reject set.
+
     Args:
         file_path: Path to document
+        rules_override: Processing rules known in advance (only
+            "auto_reject" and "reason" are consulted here)
+        time_ns: Result timestamp as time.time_ns() (default: now); batches
+            pass one shared value
 
     Returns:
         PipelineResult with complete analysis
     """
-    timestamp = datetime.now().isoformat()
+    time_ns = time_ns or time.time_ns()
+
+    if rules_override and rules_override.get("auto_reject"):
+        reason = rules_override.get("reason", "Auto-rejected")
+        return _rejected_result(file_path, time_ns, reason, "auto_reject")
 
-    # Step 1: Analyze document
-    analysis = analyze_document(file_path)
+    # Step 1: Analyze document (served from ANALYSIS_CACHE_DIR on re-runs)
+    analysis = analyze_document_cached(file_path)
 
     # Step 2: Validate metadata
     validation, metadata = validate_file(file_path, analysis)
@@ -958,16 +1598,17 @@ def process_document(file_path: str) -> PipelineResult:
     # Combine confidence
     combined_confidence = analysis.confidence * validation.confidence
 
-    # Combine all issues
-    all_errors = validation.errors.copy()
+    # Combine all issues (own lists, so later appends to either the result or
+    # the stage results don't leak into the other)
+    all_errors = list(validation.errors)
     all_warnings = analysis.warnings + validation.warnings
-    all_red_flags = analysis.red_flags.copy()
+    all_red_flags = list(analysis.red_flags)
 
     # Create result
     result = PipelineResult(
         file_path=file_path,
         file_type=analysis.file_type,
-        timestamp=timestamp,
+        time_ns=time_ns,
         analysis=analysis,
         validation=validation,
         decision=decision,
@@ -982,6 +1623,189 @@ def process_document(file_path: str) -> PipelineResult:
     return result
 
 
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+
+# On-disk cache of whole pipeline results, kept across runs (unset disables).
+# Entries are pickles and are loaded as such: the directory must be trusted
+# and writable only by this service
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR")
+
+# Key entries by file content instead of path + mtime + size
+RESULT_CACHE_BY_CONTENT = os.getenv("RESULT_CACHE_BY_CONTENT", "") == "1"
+
+# Bump when validators, processing rules or decision logic change results,
+# so entries written by older code are ignored
+RESULT_CACHE_VERSION = 1
+
+
+def _result_cache_path(file_path: str, rules_override: Optional[dict] = None) -> Optional[str]:
+    """Disk cache file for a file's pipeline result, or None if the cache is off."""
+    if not RESULT_CACHE_DIR:
+        return None
+    if RESULT_CACHE_BY_CONTENT:
+        file_key = get_file_hash(file_path)
+    else:
+        st = os.stat(file_path)
+        file_key = f"{os.path.abspath(file_path)}:{st.st_mtime_ns}:{st.st_size}"
+    rules_key = json.dumps(rules_override or {}, sort_keys=True, default=str)
+    # Date checks ("in the future", document age) depend on today
+    key = (
+        f"result:v{RESULT_CACHE_VERSION}:{analysis_version()}:"
+        f"{date.today().isoformat()}:{rules_key}:{file_key}"
+    )
+    name = hashlib.blake2b(key.encode(), digest_size=20).hexdigest()
+    return os.path.join(RESULT_CACHE_DIR, f"{name}.pkl")
+
+
+def process_document_cached(
+    file_path: str,
+    rules_override: Optional[dict] = None,
+    *,
+    time_ns: Optional[int] = None,
+) -> PipelineResult:
+    """
+    process_document with results persisted under RESULT_CACHE_DIR.
+
+    Keyed by absolute path, modification time and size (or by content
+    hash with RESULT_CACHE_BY_CONTENT=1), rules_override, today's date,
+    RESULT_CACHE_VERSION and the analysis cache's version tag (prompt and
+    schema versions, model), so a re-run over an unchanged folder on the
+    same day costs a stat and a pickle load per file. Hits are re-stamped
+    with time_ns. Early rejections and failed analyses are not cached.
+    Without RESULT_CACHE_DIR this is just process_document.
+
+    Entries are unpickled, so RESULT_CACHE_DIR must be a trusted directory.
+    """
+    try:
+        cache_path = _result_cache_path(file_path, rules_override)
+    except OSError:
+        cache_path = None
+    if cache_path is None:
+        return process_document(file_path, rules_override, time_ns=time_ns)
+
+    try:
+        with open(cache_path, "rb") as f:
+            result = pickle.load(f)
+        result.file_path = result.analysis.file_path = result.validation.file_path = file_path
+        result.time_ns = result.validation.validation_time_ns = time_ns or time.time_ns()
+        result.timestamp = result.validation.validation_timestamp = ""
+        return result
+    except Exception:
+        pass  # Missing or unreadable entry - recompute
+
+    result = process_document(file_path, rules_override, time_ns=time_ns)
+
+    if result.analysis is not None and ANALYSIS_FAILURE_FLAGS.isdisjoint(result.red_flags):
+        try:
+            os.makedirs(RESULT_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            warnings.warn(f"Could not write result cache: {e}", RuntimeWarning)
+
+    return result
+
+
+def _process_document_safe(file_path: str, time_ns: Optional[int] = None) -> PipelineResult:
+    """
+    process_document_cached for batch workers: a file that raises becomes a
+    REJECT result instead of aborting the whole batch.
+    """
+    try:
+        return process_document_cached(file_path, time_ns=time_ns)
+    except Exception as e:
+        return _rejected_result(
+            file_path, time_ns or time.time_ns(), f"Processing error: {e}", "processing"
+        )
+
+
+def process_documents(
+    paths: List[str],
+    workers: Optional[int] = None,
+) -> List[PipelineResult]:
+    """
+    Run process_document_cached over many files in parallel worker processes.
+
+    Files are sent to workers in chunks to amortize pickling/IPC; chunks
+    are kept small enough that every worker gets a share of short lists.
+    A file whose processing raises gets a REJECT result ("Processing
+    error: ...") and the rest of the batch carries on.
+
+    Args:
+        paths: Paths to documents
+        workers: Number of processes (default: available CPUs)
+
+    Returns:
+        List of PipelineResult in input order
+    """
+    from pipeline import available_cpus
+
+    paths = list(paths)
+    if not paths:
+        return []
+
+    workers = workers or available_cpus()
+    chunksize = max(1, min(16, len(paths) // (workers * 4)))
+
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        run = partial(_process_document_safe, time_ns=time.time_ns())
+        return list(ex.map(run, paths, chunksize=chunksize))
+
+
+def iter_process_documents(
+    paths: List[str],
+    workers: Optional[int] = None,
+) -> Iterator[Tuple[str, PipelineResult]]:
+    """
+    Streaming process_documents: yields (path, result) as each file finishes.
+
+    Results arrive in completion order, NOT input order, so callers can
+    report or store them while slower files are still running; match them
+    to inputs by the yielded path. A file whose processing raises yields a
+    REJECT result instead of ending the iteration. Files not yet started
+    are cancelled if the caller stops iterating early.
+
+    Args:
+        paths: Paths to documents
+        workers: Number of processes (default: available CPUs)
+
+    Yields:
+        Tuple of (path, PipelineResult)
+    """
+    from pipeline import available_cpus
+
+    paths = list(paths)
+    if not paths:
+        return
+
+    ex = ProcessPoolExecutor(max_workers=workers or available_cpus())
+    try:
+        batch_time_ns = time.time_ns()  # One timestamp for the whole batch
+        futures = {
+            ex.submit(_process_document_safe, path, batch_time_ns): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
+async def process_documents_async(
+    paths: List[str],
+    workers: Optional[int] = None,
+) -> List[PipelineResult]:
+    """
+    Awaitable process_documents; waits on the process pool from a thread
+    so the event loop stays free while the batch runs.
+    """
+    return await asyncio.to_thread(process_documents, paths, workers)
+
+
 # =============================================================================
 # BACKWARD COMPATIBILITY
 # =============================================================================
@@ -1002,8 +1826,6 @@ def process_claim_document(file_path: str) -> dict:
 
 if __name__ == "__main__":
 
-    import json
-
     file_path = "data/dsns_damage_certificate.pdf"
 
     print("=" * 60)